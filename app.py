@@ -1,17 +1,36 @@
 # app.py
+import sqlite3
+
 import streamlit as st
 from datetime import date
 import pandas as pd
 
-from src import db
-from src.kpi import get_kpis
-from src.utils_export import to_csv_bytes
+import init_db
+from src import db, charts, mantenimiento, precalculo
+from src.kpi import get_kpis, kpi_dataframe, get_breakdown, DIMENSIONES
+from src.utils_export import to_csv_bytes, bundle_bytes
+from src.validacion import ErrorValidacion, SI
 
 import altair as alt
 
 
 st.set_page_config(page_title="Sistema de Reciclaje Interno", layout="wide")
 
+@st.cache_resource
+def esquema_al_dia(path):
+    """Agrega a la base lo que le falte del esquema (una vez por proceso y base)."""
+    init_db.actualizar_esquema(path)
+
+try:
+    esquema_al_dia(db.DB_PATH)
+except sqlite3.OperationalError as e:
+    st.warning(f"No se pudo actualizar el esquema de la base ({e}). Ejecuta `python init_db.py`.")
+
+# ANALYZE / checkpoint / vacuum incremental cada hora en segundo plano (una vez por proceso)
+mantenimiento.iniciar_programador()
+# KPI y gráficos precalculados para todos los periodos (cada RECICLAJE_PRECALCULO_S s, 300 por defecto)
+precalculo.iniciar_precalculo()
+
 # ---------- helpers dataframe desde tu db ----------
 COLS_RES = ["fecha","proceso","lote","kg_totales","kg_reciclados","destino","responsable","periodo"]
 COLS_COS = ["mes","ingresos","costos_evitados","costos_gestion","periodo"]
@@ -31,12 +50,88 @@ def df_checklist(periodo: str | None = None, limit: int = 1000) -> pd.DataFrame:
 
 # ---------- UI ----------
 st.sidebar.title("Menú")
-page = st.sidebar.radio("Ir a:", ["Dashboard", "Registro de Residuos", "Registro de Costos", "Checklist de Cumplimiento"])
+page = st.sidebar.radio("Ir a:", ["Dashboard", "Registro de Residuos", "Registro de Costos", "Checklist de Cumplimiento", "Historial de Cambios", "Catálogos"])
 st.sidebar.info("Proyecto: Sistema de Reciclaje")
 
 def periodo_selectbox(label="Periodo"):
     return st.selectbox(label, ["PRE", "POST"])
 
+def catalogo_selectbox(label, catalogo, actual=None):
+    """Selectbox con las opciones del catálogo dim_<catalogo>; preselecciona `actual`."""
+    opts = db.opciones(catalogo)
+    if actual is not None and actual not in opts:
+        opts.append(actual)
+    return st.selectbox(label, opts, index=opts.index(actual) if actual in opts else 0)
+
+SIN_RESPONSABLE, NUEVO_RESPONSABLE = "(Sin responsable)", "(Nuevo…)"
+
+def responsable_input(key, actual=None, vacio=True):
+    """
+    Responsable desde el catálogo dim_responsable, con la opción de escribir
+    uno nuevo. Devuelve (opción elegida, texto nuevo): pasar a resolver_responsable.
+    """
+    opts = db.opciones("responsable")
+    if actual and actual not in opts:
+        opts.append(actual)
+    opts = ([SIN_RESPONSABLE] if vacio else []) + opts + [NUEVO_RESPONSABLE]
+    elegido = st.selectbox("Responsable", opts, key=f"{key}_resp",
+                           index=opts.index(actual) if actual in opts else 0)
+    nuevo = st.text_input(f"Nuevo responsable (si elegiste {NUEVO_RESPONSABLE})", key=f"{key}_resp_nuevo")
+    return elegido, nuevo
+
+def resolver_responsable(elegido, nuevo):
+    """Valor a guardar; el responsable nuevo se agrega al catálogo (ErrorValidacion si está vacío)."""
+    if elegido == SIN_RESPONSABLE:
+        return None
+    if elegido == NUEVO_RESPONSABLE:
+        db.agregar_opcion("responsable", nuevo)
+        return nuevo.strip()
+    return elegido
+
+def admin_lote(tabla, opciones):
+    """Operaciones en lote del tab Administrar: por IDs seleccionados o por filtro."""
+    with st.expander("Operaciones en lote"):
+        modo = st.radio("Aplicar a", ["Registros seleccionados", "Filtro"], horizontal=True, key=f"lote_modo_{tabla}")
+        filtro = {}
+        if modo == "Registros seleccionados":
+            sel = st.multiselect("Registros", list(opciones.keys()), key=f"lote_ids_{tabla}")
+            filtro["ids"] = [opciones[k] for k in sel]
+        else:
+            c1, c2, c3 = st.columns(3)
+            with c1:
+                per = st.selectbox("Periodo actual", ["(Todos)", "PRE", "POST"], key=f"lote_per_{tabla}")
+            with c2:
+                desde = st.date_input("Desde", value=None, key=f"lote_desde_{tabla}")
+            with c3:
+                hasta = st.date_input("Hasta", value=None, key=f"lote_hasta_{tabla}")
+            filtro = {"periodo": None if per == "(Todos)" else per, "desde": desde, "hasta": hasta}
+
+        acciones = ["Cambiar periodo", "Eliminar"] if tabla == "costos" else ["Cambiar periodo", "Reasignar responsable", "Eliminar"]
+        accion = st.selectbox("Acción", acciones, key=f"lote_accion_{tabla}")
+        if accion == "Cambiar periodo":
+            nuevo = st.selectbox("Nuevo periodo", ["PRE", "POST"], key=f"lote_nuevo_per_{tabla}")
+        elif accion == "Reasignar responsable":
+            nuevo = responsable_input(f"lote_{tabla}", vacio=False)
+        else:
+            confirmado = st.checkbox("Confirmo que quiero eliminar todos los registros del filtro",
+                                     key=f"lote_confirmar_{tabla}")
+
+        if st.button("Aplicar a todos", key=f"lote_aplicar_{tabla}",
+                     disabled=accion == "Eliminar" and not confirmado):
+            if filtro.get("ids") == []:
+                st.warning("Selecciona al menos un registro.")
+                return
+            try:
+                if accion == "Cambiar periodo":
+                    n = db.set_periodo_lote(tabla, nuevo, **filtro)
+                elif accion == "Reasignar responsable":
+                    n = db.set_responsable_lote(tabla, resolver_responsable(*nuevo), **filtro)
+                else:
+                    n = db.delete_lote(tabla, **filtro)
+                st.success(f"{n} registros afectados. Refresca la pestaña.")
+            except ValueError as e:
+                st.error(str(e))
+
 # =================== DASHBOARD ===================
 # =================== DASHBOARD ===================
 if page == "Dashboard":
@@ -61,16 +156,7 @@ if page == "Dashboard":
     # ---------- Exportar KPI (solo CSV por ahora) ----------
     st.markdown("### Exportar indicadores")
     
-    df_kpi = pd.DataFrame(
-        [
-            {
-                "periodo": "TODOS" if periodo_sel == "(Todos)" else periodo_sel,
-                "% reciclados": float(kpis["porc_reciclados"]),
-                "ahorro_neto": float(kpis["ahorro_neto"]),
-                "% cumplimiento": float(kpis["porc_cumplimiento"]),
-            }
-        ]
-    )
+    df_kpi = kpi_dataframe(periodo=periodo_arg)
     
     st.download_button(
         "⬇️ Exportar KPI (CSV)",
@@ -81,59 +167,41 @@ if page == "Dashboard":
     
     st.caption("La exportación a PDF está desactivada temporalmente en esta versión.")
 
+    # ---------- Exportar todo: tablas + KPI en un ZIP ----------
+    with st.expander("Exportar todo (residuos, costos, checklist y KPI)"):
+        c1, c2 = st.columns(2)
+        with c1:
+            desde = st.date_input("Desde", value=None, key="bundle_desde")
+        with c2:
+            hasta = st.date_input("Hasta", value=None, key="bundle_hasta")
+        if st.button("Preparar paquete"):
+            st.download_button(
+                "⬇️ Descargar paquete (ZIP)",
+                data=bundle_bytes(periodo_arg, desde, hasta),
+                file_name=f"reciclaje_{'todos' if periodo_sel == '(Todos)' else periodo_sel}.zip",
+                mime="application/zip",
+            )
+
 
 
     st.markdown("---")
     st.markdown("### Visualizaciones por periodo")
 
-    # Preparamos los 3 dataframes una sola vez
-    df_r = df_residuos(periodo_arg)
-    df_c = df_costos(periodo_arg)
-    df_x = df_checklist(periodo_arg)
-
-    tab1, tab2, tab3 = st.tabs(
+    # Specs Vega-Lite pre-agregados y cacheados por (periodo, versión de datos)
+    tab1, tab2, tab3, tab4 = st.tabs(
         [
             "% Reciclados por mes",
             "Ahorro neto mensual (S/.)",
             "% Cumplimiento en checklist",
+            "Desglose por dimensión",
         ]
     )
 
     # ---------- Gráfico 1: tendencia % reciclado por mes ----------
     with tab1:
-        if not df_r.empty:
-            df_r["fecha"] = pd.to_datetime(df_r["fecha"])
-            grp = df_r.groupby(pd.Grouper(key="fecha", freq="MS")).agg(
-                kg_tot=("kg_totales", "sum"),
-                kg_rec=("kg_reciclados", "sum"),
-            )
-            grp["porc_reciclado"] = grp.apply(
-                lambda r: 0.0 if r["kg_tot"] == 0 else (r["kg_rec"] / r["kg_tot"]) * 100,
-                axis=1,
-            ).round(2)
-
-            # Pasamos el índice a columna para Altair
-            grp = grp.reset_index()
-            grp["mes"] = grp["fecha"].dt.strftime("%Y-%m")
-
-            chart1 = (
-                alt.Chart(grp)
-                .mark_line(point=True)
-                .encode(
-                    x=alt.X("fecha:T", title="Mes", axis=alt.Axis(format="%b %y")),
-                    y=alt.Y("porc_reciclado:Q", title="% reciclado"),
-                    tooltip=[
-                        alt.Tooltip("mes:N", title="Mes"),
-                        alt.Tooltip("kg_tot:Q", title="Kg totales", format=".1f"),
-                        alt.Tooltip("kg_rec:Q", title="Kg reciclados", format=".1f"),
-                        alt.Tooltip("porc_reciclado:Q", title="% reciclado", format=".1f"),
-                    ],
-                )
-                .properties(height=260)
-                .interactive()
-            )
-
-            st.altair_chart(chart1, use_container_width=True)
+        chart1 = charts.chart_spec("reciclaje", periodo_arg)
+        if chart1:
+            st.vega_lite_chart(chart1, use_container_width=True)
             st.caption(
                 "Muestra la evolución mensual del porcentaje de residuos reciclados "
                 "respecto al total generado."
@@ -143,34 +211,9 @@ if page == "Dashboard":
 
     # ---------- Gráfico 2: ahorro neto por mes ----------
     with tab2:
-        if not df_c.empty:
-            df_c["mes_dt"] = pd.to_datetime(df_c["mes"] + "-01", errors="coerce")
-            df_c["ahorro_neto"] = (
-                df_c["ingresos"] + df_c["costos_evitados"] - df_c["costos_gestion"]
-            )
-            ahorro = (
-                df_c.groupby(pd.Grouper(key="mes_dt", freq="MS"))["ahorro_neto"]
-                .sum()
-                .reset_index()
-            )
-            ahorro["mes"] = ahorro["mes_dt"].dt.strftime("%Y-%m")
-
-            chart2 = (
-                alt.Chart(ahorro)
-                .mark_bar()
-                .encode(
-                    x=alt.X("mes_dt:T", title="Mes", axis=alt.Axis(format="%b %y")),
-                    y=alt.Y("ahorro_neto:Q", title="Ahorro neto (S/.)"),
-                    tooltip=[
-                        alt.Tooltip("mes:N", title="Mes"),
-                        alt.Tooltip("ahorro_neto:Q", title="Ahorro neto (S/.)", format=".2f"),
-                    ],
-                )
-                .properties(height=260)
-                .interactive()
-            )
-
-            st.altair_chart(chart2, use_container_width=True)
+        chart2 = charts.chart_spec("ahorro", periodo_arg)
+        if chart2:
+            st.vega_lite_chart(chart2, use_container_width=True)
             st.caption(
                 "Suma mensual del ahorro neto considerando ingresos por venta, "
                 "costos evitados y costos de gestión."
@@ -181,46 +224,58 @@ if page == "Dashboard":
 
     # ---------- Gráfico 3: % cumplimiento checklist ----------
     with tab3:
-        if not df_x.empty:
-            df_x["fecha"] = pd.to_datetime(df_x["fecha"])
-            items = [f"item{i}" for i in range(1, 11)]
-
-            # Convertimos Sí / No a 1 / 0
-            df_x[items] = df_x[items].applymap(
-                lambda v: 1 if str(v).strip().lower() in ("si", "sí", "1", "true") else 0
+        chart3 = charts.chart_spec("cumplimiento", periodo_arg)
+        if chart3:
+            st.vega_lite_chart(chart3, use_container_width=True)
+            st.caption(
+                "Promedio mensual del porcentaje de ítems cumplidos en el checklist."
             )
+        else:
+            st.info("No hay datos de checklist para graficar.")
 
-            df_x["porc_cumplimiento"] = (df_x[items].sum(axis=1) / 10) * 100
-            cump = (
-                df_x.groupby(pd.Grouper(key="fecha", freq="MS"))["porc_cumplimiento"]
-                .mean()
-                .reset_index()
-            )
-            cump["mes"] = cump["fecha"].dt.strftime("%Y-%m")
-
-            chart3 = (
-                alt.Chart(cump)
-                .mark_line(point=True)
-                .encode(
-                    x=alt.X("fecha:T", title="Mes", axis=alt.Axis(format="%b %y")),
-                    y=alt.Y("porc_cumplimiento:Q", title="% cumplimiento"),
-                    tooltip=[
-                        alt.Tooltip("mes:N", title="Mes"),
-                        alt.Tooltip(
-                            "porc_cumplimiento:Q", title="% cumplimiento", format=".1f"
-                        ),
-                    ],
+    # ---------- Desglose: KPI por proceso / destino / área / responsable ----------
+    with tab4:
+        c1, c2 = st.columns(2)
+        with c1:
+            dimension = st.selectbox("Agrupar por", list(DIMENSIONES.keys()))
+        with c2:
+            por_mes = st.checkbox("Separar por mes")
+        df_b = get_breakdown(dimension, periodo=periodo_arg, por_mes=por_mes)
+
+        if not df_b.empty:
+            st.dataframe(df_b, use_container_width=True, hide_index=True)
+            if not por_mes:
+                # "area" solo existe en el checklist: se grafica el % cumplimiento
+                if "porc_reciclados" in df_b:
+                    y = alt.Y("porc_reciclados:Q", title="% reciclado")
+                    tooltip = [
+                        alt.Tooltip(f"{dimension}:N"),
+                        alt.Tooltip("kg_totales:Q", title="Kg totales", format=".1f"),
+                        alt.Tooltip("porc_reciclados:Q", title="% reciclado", format=".1f"),
+                    ]
+                else:
+                    y = alt.Y("porc_cumplimiento:Q", title="% cumplimiento")
+                    tooltip = [
+                        alt.Tooltip(f"{dimension}:N"),
+                        alt.Tooltip("porc_cumplimiento:Q", title="% cumplimiento", format=".1f"),
+                    ]
+                chart4 = (
+                    alt.Chart(df_b.dropna(subset=[dimension]))
+                    .mark_bar()
+                    .encode(
+                        x=alt.X(f"{dimension}:N", title=dimension.capitalize(), sort="-y"),
+                        y=y,
+                        tooltip=tooltip,
+                    )
+                    .properties(height=260)
                 )
-                .properties(height=260)
-                .interactive()
-            )
-
-            st.altair_chart(chart3, use_container_width=True)
+                st.altair_chart(chart4, use_container_width=True)
             st.caption(
-                "Promedio mensual del porcentaje de ítems cumplidos en el checklist."
+                "KPI agrupados por dimensión. El % cumplimiento por proceso usa el "
+                "Área/Proceso registrado en el checklist; el área solo existe en el checklist."
             )
         else:
-            st.info("No hay datos de checklist para graficar.")
+            st.info("No hay datos para desglosar.")
 
 
 
@@ -242,7 +297,7 @@ if page == "Registro de Residuos":
                 # Fila 2: Proceso / Lote
                 col3, col4 = st.columns(2)
                 with col3:
-                    proceso = st.selectbox("Proceso", ["Corte", "Soldadura", "Ensamble"])
+                    proceso = catalogo_selectbox("Proceso", "proceso")
                 with col4:
                     lote = st.text_input("Lote")
 
@@ -260,27 +315,27 @@ if page == "Registro de Residuos":
                 # Fila 4: Destino / Responsable
                 col7, col8 = st.columns(2)
                 with col7:
-                    destino = st.selectbox("Destino", ["Reúso", "Reciclaje", "Venta"])
+                    destino = catalogo_selectbox("Destino", "destino")
                 with col8:
-                    responsable = st.text_input("Responsable")
+                    responsable = responsable_input("form_residuos")
 
                 submitted = st.form_submit_button("Guardar")
 
             if submitted:
-                if kg_reciclados > kg_totales:
-                    st.error("Los Kg reciclados no pueden ser mayores que los Kg totales.")
-                else:
+                try:
                     db.insert_residuo(
-                        str(fecha),
+                        fecha,
                         proceso,
                         lote,
-                        float(kg_totales),
-                        float(kg_reciclados),
+                        kg_totales,
+                        kg_reciclados,
                         destino,
-                        responsable,
+                        resolver_responsable(*responsable),
                         periodo,
                     )
                     st.success("Registro guardado ✅")
+                except ErrorValidacion as e:
+                    st.error(str(e))
 
 
         st.subheader("Últimos registros")
@@ -307,12 +362,12 @@ if page == "Registro de Residuos":
                     from datetime import date as _d
                     with st.form("edit_residuo"):
                         fecha = st.date_input("Fecha", _d.fromisoformat(fecha))
-                        proceso = st.selectbox("Proceso", ["Corte", "Soldadura", "Ensamble"], index=["Corte","Soldadura","Ensamble"].index(proceso))
+                        proceso = catalogo_selectbox("Proceso", "proceso", proceso)
                         lote = st.text_input("Lote", value=lote or "")
                         kg_totales = st.number_input("Kg Totales", min_value=0.0, step=0.1, value=float(kg_totales))
                         kg_reciclados = st.number_input("Kg Reciclados", min_value=0.0, step=0.1, value=float(kg_reciclados))
-                        destino = st.selectbox("Destino", ["Reúso","Reciclaje","Venta"], index=["Reúso","Reciclaje","Venta"].index(destino))
-                        responsable = st.text_input("Responsable", value=responsable or "")
+                        destino = catalogo_selectbox("Destino", "destino", destino)
+                        responsable = responsable_input("edit_residuo", responsable)
                         periodo = st.selectbox("Periodo", ["PRE","POST"], index=["PRE","POST"].index(periodo or "PRE"))
                         c1, c2 = st.columns(2)
                         with c1:
@@ -320,14 +375,16 @@ if page == "Registro de Residuos":
                         with c2:
                             delb = st.form_submit_button("Eliminar 🗑️")
                     if upd:
-                        if kg_reciclados > kg_totales:
-                            st.error("Los Kg reciclados no pueden ser mayores que los Kg totales.")
-                        else:
-                            db.update_residuo(sel_id, str(fecha), proceso, lote, float(kg_totales), float(kg_reciclados), destino, responsable, periodo)
+                        try:
+                            db.update_residuo(sel_id, fecha, proceso, lote, kg_totales, kg_reciclados, destino,
+                                             resolver_responsable(*responsable), periodo)
                             st.success("Registro actualizado")
+                        except ErrorValidacion as e:
+                            st.error(str(e))
                     if delb:
                         db.delete_residuo(sel_id)
                         st.success("Registro eliminado. Refresca la pestaña.")
+                admin_lote("residuos", opciones)
 
     # ---- Exportar ----
         with tab3:
@@ -370,8 +427,11 @@ if page == "Registro de Costos":
             submitted = st.form_submit_button("Guardar")
 
         if submitted:
-            db.insert_costos(mes, float(ingresos), float(evitados), float(gestion), periodo)
-            st.success("Registro de costos guardado ✅")
+            try:
+                db.insert_costos(mes, ingresos, evitados, gestion, periodo)
+                st.success("Registro de costos guardado ✅")
+            except ErrorValidacion as e:
+                st.error(str(e))
 
 
         st.subheader("Últimos registros")
@@ -403,11 +463,15 @@ if page == "Registro de Costos":
                     with c2:
                         delb = st.form_submit_button("Eliminar 🗑️")
                 if upd:
-                    db.update_costos(sel_id, mes, float(ingresos), float(evitados), float(gestion), periodo)
-                    st.success("Registro actualizado")
+                    try:
+                        db.update_costos(sel_id, mes, ingresos, evitados, gestion, periodo)
+                        st.success("Registro actualizado")
+                    except ErrorValidacion as e:
+                        st.error(str(e))
                 if delb:
                     db.delete_costos(sel_id)
                     st.success("Registro eliminado. Refresca la pestaña.")
+            admin_lote("costos", opciones)
 
     # ---- Exportar ----
     with tab3:
@@ -435,9 +499,9 @@ if page == "Checklist de Cumplimiento":
             c1, c2 = st.columns(2)
             with c1:
                 fecha = st.date_input("Fecha", date.today())
-                area = st.selectbox("Área/Proceso", ["Corte", "Soldadura", "Ensamble", "Almacén"])
+                area = catalogo_selectbox("Área/Proceso", "area")
             with c2:
-                responsable = st.text_input("Responsable")
+                responsable = responsable_input("form_checklist")
                 periodo = periodo_selectbox()
 
             st.markdown("Marca **Sí** o **No** para cada ítem:")
@@ -463,8 +527,11 @@ if page == "Checklist de Cumplimiento":
             submitted = st.form_submit_button("Guardar")
 
         if submitted:
-            db.insert_checklist(str(fecha), area, responsable, items, periodo)
-            st.success("Checklist guardado ✅")
+            try:
+                db.insert_checklist(fecha, area, resolver_responsable(*responsable), items, periodo)
+                st.success("Checklist guardado ✅")
+            except ErrorValidacion as e:
+                st.error(str(e))
 
 
         st.subheader("Últimos registros")
@@ -487,12 +554,12 @@ if page == "Checklist de Cumplimiento":
                 from datetime import date as _d
                 with st.form("edit_checklist"):
                     fecha = st.date_input("Fecha", _d.fromisoformat(fecha))
-                    area = st.selectbox("Área/Proceso", ["Corte","Soldadura","Ensamble","Almacén"], index=["Corte","Soldadura","Ensamble","Almacén"].index(area))
-                    responsable = st.text_input("Responsable", value=responsable or "")
+                    area = catalogo_selectbox("Área/Proceso", "area", area)
+                    responsable = responsable_input("edit_checklist", responsable)
                     st.markdown("Marca **Sí** o **No** para cada ítem:")
                     items = [st.selectbox(
                         f"Ítem {i}", opciones_SN, key=f"e{i}",
-                        index=0 if str(items[i-1]).strip().lower() in ("si","sí") else 1
+                        index=0 if items[i-1] == SI else 1
                     ) for i in range(1,11)]
                     periodo = st.selectbox("Periodo", ["PRE","POST"], index=["PRE","POST"].index(periodo or "PRE"))
                     c1, c2 = st.columns(2)
@@ -501,11 +568,15 @@ if page == "Checklist de Cumplimiento":
                     with c2:
                         delb = st.form_submit_button("Eliminar 🗑️")
                 if upd:
-                    db.update_checklist(sel_id, str(fecha), area, responsable, items, periodo)
-                    st.success("Registro actualizado")
+                    try:
+                        db.update_checklist(sel_id, fecha, area, resolver_responsable(*responsable), items, periodo)
+                        st.success("Registro actualizado")
+                    except ErrorValidacion as e:
+                        st.error(str(e))
                 if delb:
                     db.delete_checklist(sel_id)
                     st.success("Registro eliminado. Refresca la pestaña.")
+            admin_lote("checklist", opciones)
 
     # ---- Exportar ----
     with tab3:
@@ -520,3 +591,34 @@ if page == "Checklist de Cumplimiento":
             file_name=f"checklist_{'todos' if per is None else per}.csv",
             mime="text/csv",
         )
+
+# =================== HISTORIAL ===================
+if page == "Historial de Cambios":
+    st.title("Historial de Cambios")
+    cant = st.selectbox("Mostrar cambios", [50, 200, 1000, 5000], index=1)
+    try:
+        df = db.df_cambios(limit=cant)
+    except sqlite3.OperationalError:
+        st.info("Esta base todavía no tiene registro de cambios. Ejecuta `python init_db.py` para crearlo.")
+    else:
+        df["op"] = df["op"].map({"I": "Alta", "U": "Edición", "D": "Baja"})
+        st.dataframe(df, use_container_width=True, hide_index=True)
+        st.caption("Registro de solo agregado: cada alta, edición o baja queda con su número de secuencia.")
+
+# =================== CATÁLOGOS ===================
+if page == "Catálogos":
+    st.title("Catálogos")
+    st.caption("Opciones de los formularios. Lo que se agregue aquí aparece de inmediato en los registros.")
+    etiquetas = {"proceso": "Procesos", "destino": "Destinos", "area": "Áreas", "responsable": "Responsables"}
+    for cat, col in zip(db.CATALOGOS, st.columns(len(db.CATALOGOS))):
+        with col:
+            st.subheader(etiquetas[cat])
+            st.dataframe(pd.DataFrame({"nombre": db.opciones(cat)}), use_container_width=True, hide_index=True)
+            with st.form(f"form_cat_{cat}", clear_on_submit=True):
+                nuevo = st.text_input("Nuevo valor")
+                if st.form_submit_button("Agregar"):
+                    try:
+                        db.agregar_opcion(cat, nuevo)
+                        st.success(f"Agregado: {nuevo.strip()}")
+                    except ErrorValidacion as e:
+                        st.error(str(e))
@@ -0,0 +1,21 @@
+# export_bundle.py
+"""Exporta en un ZIP residuos, costos, checklist y KPI (lo mismo que el botón del Dashboard)."""
+import argparse
+from pathlib import Path
+
+from src.utils_export import write_bundle
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--periodo", choices=["PRE", "POST"], help="por defecto, todos")
+    ap.add_argument("--desde", help="fecha inicial YYYY-MM-DD")
+    ap.add_argument("--hasta", help="fecha final YYYY-MM-DD")
+    ap.add_argument("-o", "--salida", type=Path, help="archivo .zip de salida")
+    args = ap.parse_args()
+
+    salida = args.salida or Path(f"reciclaje_{(args.periodo or 'todos').lower()}.zip")
+    write_bundle(salida, args.periodo, args.desde, args.hasta)
+    print(f"Paquete exportado en: {salida.resolve()}")
+
+if __name__ == "__main__":
+    main()
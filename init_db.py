@@ -1,14 +1,18 @@
 # init_db.py
+import re
 import sqlite3
 from pathlib import Path
 
 DB_PATH = Path(__file__).parent / "db" / "reciclaje.db"
 DB_PATH.parent.mkdir(exist_ok=True)
 
-DDL = """
+PRAGMAS = """
+PRAGMA auto_vacuum = INCREMENTAL;  -- solo tiene efecto al crear la base
 PRAGMA journal_mode = WAL;
 PRAGMA foreign_keys = ON;
+"""
 
+DDL = """
 CREATE TABLE IF NOT EXISTS residuos (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     fecha TEXT NOT NULL,
@@ -17,7 +21,8 @@ CREATE TABLE IF NOT EXISTS residuos (
     kg_totales REAL NOT NULL,
     kg_reciclados REAL NOT NULL,
     destino TEXT,
-    responsable TEXT
+    responsable TEXT,
+    periodo TEXT DEFAULT 'PRE'
 );
 
 CREATE TABLE IF NOT EXISTS costos (
@@ -25,7 +30,8 @@ CREATE TABLE IF NOT EXISTS costos (
     mes TEXT NOT NULL,
     ingresos REAL NOT NULL,
     costos_evitados REAL NOT NULL,
-    costos_gestion REAL NOT NULL
+    costos_gestion REAL NOT NULL,
+    periodo TEXT DEFAULT 'PRE'
 );
 
 CREATE TABLE IF NOT EXISTS checklist (
@@ -34,18 +40,238 @@ CREATE TABLE IF NOT EXISTS checklist (
     area TEXT,
     responsable TEXT,
     item1 TEXT, item2 TEXT, item3 TEXT, item4 TEXT, item5 TEXT,
-    item6 TEXT, item7 TEXT, item8 TEXT, item9 TEXT, item10 TEXT
+    item6 TEXT, item7 TEXT, item8 TEXT, item9 TEXT, item10 TEXT,
+    periodo TEXT DEFAULT 'PRE'
 );
+
+-- Catálogos: opciones de los formularios. Tras migrate_dimensiones.py,
+-- residuos y checklist guardan el id en lugar del texto.
+CREATE TABLE IF NOT EXISTS dim_proceso (id INTEGER PRIMARY KEY, nombre TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS dim_destino (id INTEGER PRIMARY KEY, nombre TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS dim_area (id INTEGER PRIMARY KEY, nombre TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS dim_responsable (id INTEGER PRIMARY KEY, nombre TEXT NOT NULL UNIQUE);
+
+INSERT OR IGNORE INTO dim_proceso (nombre) VALUES ('Corte'), ('Soldadura'), ('Ensamble');
+INSERT OR IGNORE INTO dim_destino (nombre) VALUES ('Reúso'), ('Reciclaje'), ('Venta');
+INSERT OR IGNORE INTO dim_area (nombre) VALUES ('Corte'), ('Soldadura'), ('Ensamble'), ('Almacén');
+
+-- Índices de cobertura para las consultas filtradas por periodo (KPI y
+-- gráficos): incluyen las columnas que leen, así SQLite responde desde el
+-- índice sin tocar la tabla.
+CREATE INDEX IF NOT EXISTS ix_residuos_proceso
+    ON residuos (periodo, proceso, fecha, kg_totales, kg_reciclados);
+CREATE INDEX IF NOT EXISTS ix_residuos_destino
+    ON residuos (periodo, destino, fecha, kg_totales, kg_reciclados);
+CREATE INDEX IF NOT EXISTS ix_residuos_responsable
+    ON residuos (periodo, responsable, fecha, kg_totales, kg_reciclados);
+CREATE INDEX IF NOT EXISTS ix_checklist_area
+    ON checklist (periodo, area, fecha,
+                  item1, item2, item3, item4, item5, item6, item7, item8, item9, item10);
+CREATE INDEX IF NOT EXISTS ix_checklist_responsable
+    ON checklist (periodo, responsable, fecha,
+                  item1, item2, item3, item4, item5, item6, item7, item8, item9, item10);
+
+-- Registro de cambios (solo se agregan filas). Lo llenan los triggers de
+-- abajo, así queda registrada cualquier escritura, venga de donde venga.
+-- op: 'I' insert, 'U' update, 'D' delete; columnas solo en 'U'.
+CREATE TABLE IF NOT EXISTS cambios (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    tabla TEXT NOT NULL,
+    fila_id INTEGER NOT NULL,
+    op TEXT NOT NULL,
+    columnas TEXT,
+    ts INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+);
+
+CREATE TRIGGER IF NOT EXISTS cambios_sin_update BEFORE UPDATE ON cambios
+BEGIN SELECT RAISE(ABORT, 'cambios es de solo agregado'); END;
+CREATE TRIGGER IF NOT EXISTS cambios_sin_delete BEFORE DELETE ON cambios
+BEGIN SELECT RAISE(ABORT, 'cambios es de solo agregado'); END;
 """
 
-def main():
-    conn = sqlite3.connect(DB_PATH)
+# columnas vigiladas por los triggers de auditoría
+COLUMNAS = {
+    "residuos": ["fecha", "proceso", "lote", "kg_totales", "kg_reciclados", "destino", "responsable", "periodo"],
+    "costos": ["mes", "ingresos", "costos_evitados", "costos_gestion", "periodo"],
+    "checklist": ["fecha", "area", "responsable",
+                  "item1", "item2", "item3", "item4", "item5",
+                  "item6", "item7", "item8", "item9", "item10", "periodo"],
+}
+
+def triggers_auditoria(tabla, columnas):
+    distintas = " OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in columnas)
+    lista = " || ".join(f"CASE WHEN OLD.{c} IS NOT NEW.{c} THEN ',{c}' ELSE '' END" for c in columnas)
+    return f"""
+CREATE TRIGGER IF NOT EXISTS {tabla}_cambios_i AFTER INSERT ON {tabla}
+BEGIN INSERT INTO cambios (tabla, fila_id, op) VALUES ('{tabla}', NEW.id, 'I'); END;
+CREATE TRIGGER IF NOT EXISTS {tabla}_cambios_d AFTER DELETE ON {tabla}
+BEGIN INSERT INTO cambios (tabla, fila_id, op) VALUES ('{tabla}', OLD.id, 'D'); END;
+CREATE TRIGGER IF NOT EXISTS {tabla}_cambios_u AFTER UPDATE ON {tabla}
+WHEN {distintas}
+BEGIN
+    INSERT INTO cambios (tabla, fila_id, op, columnas)
+    VALUES ('{tabla}', NEW.id, 'U', substr({lista}, 2));
+END;
+"""
+
+# ---------- RESÚMENES PARA EL DESGLOSE ----------
+# Una fila por combinación de dimensiones, periodo y mes con conteo y sumas,
+# mantenida por triggers. src/kpi.py:get_breakdown agrupa estas pocas filas
+# en lugar de recorrer millones de registros.
+ITEMS = [f"item{i}" for i in range(1, 11)]
+RESUMENES = {
+    "residuos": (["proceso", "destino", "responsable", "periodo"],
+                 {"n": "1", "kg_totales": "COALESCE({r}.kg_totales, 0)",
+                  "kg_reciclados": "COALESCE({r}.kg_reciclados, 0)"}),
+    "checklist": (["area", "responsable", "periodo"],
+                  {"n": "1", "sies": " + ".join(f"({{r}}.{c} = 'Sí')" for c in ITEMS)}),
+}
+
+def _resumen_sumar(tabla, r, signo):
+    """SQL que suma (o resta) la fila `r` (NEW/OLD) a su fila de resumen."""
+    claves, sumas = RESUMENES[tabla]
+    cond = " AND ".join(f"{c} IS {r}.{c}" for c in claves) + f" AND mes IS substr({r}.fecha, 1, 7)"
+    sets = ", ".join(f"{c} = {c} {signo} ({e.format(r=r)})" for c, e in sumas.items())
+    # changes() dentro del trigger cuenta la sentencia anterior del mismo trigger:
+    # si no había fila que actualizar, se crea (solo al sumar).
+    resto = f"""
+    INSERT INTO resumen_{tabla} ({", ".join(claves)}, mes, {", ".join(sumas)})
+    SELECT {", ".join(f"{r}.{c}" for c in claves)}, substr({r}.fecha, 1, 7),
+           {", ".join(e.format(r=r) for e in sumas.values())}
+    WHERE changes() = 0;""" if signo == "+" else f"""
+    DELETE FROM resumen_{tabla} WHERE n = 0 AND {cond};"""
+    return f"""
+    UPDATE resumen_{tabla} SET {sets} WHERE {cond};{resto}"""
+
+def resumen_sql(tabla):
+    """Tabla de resumen, sus triggers y, si está vacía, su carga inicial."""
+    claves, sumas = RESUMENES[tabla]
+    # columnas que cambian la fila de resumen (claves, fecha o parte de una suma)
+    vigiladas = ", ".join(c for c in COLUMNAS[tabla]
+                          if c in claves or c == "fecha" or any(f"{{r}}.{c}" in e for e in sumas.values()))
+    return f"""
+CREATE TABLE IF NOT EXISTS resumen_{tabla} ({", ".join(claves)}, mes, {", ".join(sumas)});
+CREATE INDEX IF NOT EXISTS ix_resumen_{tabla} ON resumen_{tabla} ({", ".join(claves)}, mes);
+
+CREATE TRIGGER IF NOT EXISTS {tabla}_resumen_i AFTER INSERT ON {tabla}
+BEGIN{_resumen_sumar(tabla, "NEW", "+")}
+END;
+CREATE TRIGGER IF NOT EXISTS {tabla}_resumen_d AFTER DELETE ON {tabla}
+BEGIN{_resumen_sumar(tabla, "OLD", "-")}
+END;
+CREATE TRIGGER IF NOT EXISTS {tabla}_resumen_u AFTER UPDATE OF {vigiladas} ON {tabla}
+BEGIN{_resumen_sumar(tabla, "OLD", "-")}{_resumen_sumar(tabla, "NEW", "+")}
+END;
+
+-- carga inicial (bases existentes, o tras reconstruir la tabla)
+INSERT INTO resumen_{tabla} ({", ".join(claves)}, mes, {", ".join(sumas)})
+SELECT {", ".join(claves)}, substr(fecha, 1, 7), {", ".join(f"SUM({e.format(r=tabla)})" for e in sumas.values())}
+FROM {tabla} WHERE NOT EXISTS (SELECT 1 FROM resumen_{tabla})
+GROUP BY {", ".join(claves)}, substr(fecha, 1, 7);
+"""
+
+# Catálogos: además de los valores iniciales, los ya registrados (mientras se
+# guardan como texto). Se leen de los resúmenes, que son chicos.
+SEMILLAS = """
+INSERT OR IGNORE INTO dim_proceso (nombre)
+    SELECT DISTINCT proceso FROM resumen_residuos WHERE typeof(proceso) = 'text' AND proceso <> '';
+INSERT OR IGNORE INTO dim_destino (nombre)
+    SELECT DISTINCT destino FROM resumen_residuos WHERE typeof(destino) = 'text' AND destino <> '';
+INSERT OR IGNORE INTO dim_area (nombre)
+    SELECT DISTINCT area FROM resumen_checklist WHERE typeof(area) = 'text' AND area <> '';
+INSERT OR IGNORE INTO dim_responsable (nombre)
+    SELECT DISTINCT responsable FROM resumen_residuos WHERE typeof(responsable) = 'text' AND responsable <> ''
+    UNION SELECT DISTINCT responsable FROM resumen_checklist WHERE typeof(responsable) = 'text' AND responsable <> '';
+"""
+
+def esquema_sql():
+    """Tablas, índices, triggers y resúmenes (todo con IF NOT EXISTS)."""
+    return (DDL + "".join(triggers_auditoria(t, c) for t, c in COLUMNAS.items())
+            + "".join(resumen_sql(t) for t in RESUMENES) + SEMILLAS)
+
+def sql_reconstruir_tabla(conn, tabla, cambios):
+    """
+    SQL que reescribe `tabla` cambiando el tipo de algunas columnas (SQLite
+    no tiene ALTER COLUMN). cambios: {columna: (tipo nuevo, expresión SQL
+    que calcula el valor nuevo)}. Conserva ids y la secuencia AUTOINCREMENT;
+    los índices y triggers se pierden con el DROP y se recrean ejecutando
+    esquema_sql() a continuación, en la misma transacción. Ese mismo paso
+    vuelve a cargar el resumen de la tabla, que aquí se vacía.
+    """
+    sql = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                       (tabla,)).fetchone()[0]
+    cols = [r[1] for r in conn.execute(f"PRAGMA table_info({tabla})")]
+    nueva = f"{tabla}_nueva"
+    sql = re.sub(rf'^CREATE TABLE\s+"?{tabla}"?', f"CREATE TABLE {nueva}", sql)
+    for col, (tipo, _) in cambios.items():
+        # tipo y, si lo hay, el REFERENCES que dejó una migración anterior
+        sql = re.sub(rf"\b{col}\s+\w+(\s+REFERENCES\s+\w+\s*\(\w+\))?", f"{col} {tipo}", sql, count=1)
+    select = ", ".join(cambios[c][1] if c in cambios else c for c in cols)
+    seq = (conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (tabla,)).fetchone() or [0])[0]
+    return f"""
+{sql};
+INSERT INTO {nueva} ({", ".join(cols)}) SELECT {select} FROM {tabla};
+DROP TABLE {tabla};
+ALTER TABLE {nueva} RENAME TO {tabla};
+UPDATE sqlite_sequence SET seq = MAX(seq, {seq}) WHERE name = '{tabla}';
+""" + (f"DELETE FROM resumen_{tabla};\n" if tabla in RESUMENES else "")
+
+def tipo_columna(conn, tabla, col):
+    """Tipo declarado de `tabla.col`, en mayúsculas."""
+    return {r[1]: r[2].upper() for r in conn.execute(f"PRAGMA table_info({tabla})")}[col]
+
+def _esquema_al_dia(conn):
+    # en una transacción: la carga inicial de los resúmenes no debe
+    # mezclarse con altas de otra conexión que ya disparen los triggers
+    conn.executescript("BEGIN IMMEDIATE;\n" + esquema_sql() + "\nCOMMIT;")
+
+def migrar_columnas(conn, tablas, destino, cambios, previo=None):
+    """
+    Lleva las columnas de `tablas` ({tabla: [columnas]}) al tipo `destino`
+    (migrate_enteros.py, migrate_dimensiones.py). Las tablas que ya lo
+    tienen se saltan; el resto se reescribe con sql_reconstruir_tabla y
+    cambios(tabla, cols), precedido por el SQL de previo(tabla, cols) si lo
+    hay, y el esquema se recrea, todo en una sola transacción. Devuelve las
+    tablas convertidas.
+    """
+    # catálogos y resúmenes (y el resto del esquema) antes de leer la
+    # estructura de las tablas
+    _esquema_al_dia(conn)
+    script, hechas = [], []
+    for tabla, cols in tablas.items():
+        if tipo_columna(conn, tabla, cols[0]) == destino:
+            print(f"[SKIP] {tabla} ya está en {destino}")
+            continue
+        if previo:
+            script.append(previo(tabla, cols))
+        script.append(sql_reconstruir_tabla(conn, tabla, cambios(tabla, cols)))
+        hechas.append(tabla)
+    if not hechas:
+        return hechas
     try:
-        conn.executescript(DDL)
-        conn.commit()
-        print(f"Base creada/actualizada en: {DB_PATH.resolve()}")
+        conn.executescript("BEGIN;\n" + "".join(script) + esquema_sql() + "\nCOMMIT;")
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    return hechas
+
+def actualizar_esquema(path=None):
+    """
+    Crea la base o le agrega lo que le falte (tablas, catálogos, índices,
+    triggers; todo es IF NOT EXISTS, así que repetirlo no cambia nada).
+    La app lo corre al arrancar.
+    """
+    conn = sqlite3.connect(path or DB_PATH)
+    try:
+        conn.executescript(PRAGMAS)
+        _esquema_al_dia(conn)
     finally:
         conn.close()
 
+def main():
+    actualizar_esquema()
+    print(f"Base creada/actualizada en: {DB_PATH.resolve()}")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,252 @@
+# load_test.py
+"""
+Prueba de carga de la capa de datos (src/db.py) con N sesiones simultáneas.
+
+Cada sesión repite una mezcla de operaciones realistas contra una base
+local: altas de formularios, ediciones, lecturas del Dashboard (get_kpis y
+df_*) y exportaciones. Las sesiones corren en hilos y, con --procesos,
+repartidas en varios procesos. Al final informa rendimiento, percentiles de
+latencia, errores por bloqueo ("database is locked") y crecimiento del -wal.
+
+Por defecto trabaja sobre una copia nueva en un directorio temporal; nunca
+toca db/reciclaje.db salvo que se indique con --db.
+
+    python load_test.py --procesos 2 --hilos 8 --duracion 30
+"""
+import argparse
+import json
+import multiprocessing as mp
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+
+import init_db
+import migrate_dimensiones
+import migrate_enteros
+from src import db
+from src.kpi import get_kpis
+from src.utils_export import bundle_bytes
+
+MEZCLA = {"insert": 40, "edit": 15, "dashboard": 35, "export": 10}
+PROCESOS = ["Corte", "Soldadura", "Ensamble"]
+DESTINOS = ["Reúso", "Reciclaje", "Venta"]
+
+
+# ---------- DATOS ----------
+def _fecha(rnd):
+    return (date(2025, 1, 1) + timedelta(days=rnd.randrange(365))).isoformat()
+
+def _residuo(rnd):
+    tot = round(rnd.uniform(1, 50), 1)
+    return (_fecha(rnd), rnd.choice(PROCESOS), f"L-{rnd.randrange(1000):03d}", tot,
+            round(rnd.uniform(0, tot), 1), rnd.choice(DESTINOS), f"Oper{rnd.randrange(10)}",
+            rnd.choice(["PRE", "POST"]))
+
+def preparar_base(path, filas, enteros=False, dimensiones=False):
+    """
+    Crea la base con init_db y la llena con `filas` residuos y su proporción
+    de costos/checklist. Con `enteros` y/o `dimensiones`, la pasa al modo
+    entero / de catálogos al final.
+    """
+    init_db.DB_PATH = Path(path)
+    init_db.main()
+    rnd = random.Random(0)
+    conn = sqlite3.connect(path)
+    try:
+        conn.executemany(
+            "INSERT INTO residuos (fecha, proceso, lote, kg_totales, kg_reciclados, destino, responsable, periodo)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (_residuo(rnd) for _ in range(filas)),
+        )
+        conn.executemany(
+            "INSERT INTO costos (mes, ingresos, costos_evitados, costos_gestion, periodo) VALUES (?, ?, ?, ?, ?)",
+            ((_fecha(rnd)[:7], rnd.uniform(0, 500), rnd.uniform(0, 200), rnd.uniform(0, 100),
+              rnd.choice(["PRE", "POST"])) for _ in range(max(filas // 50, 1))),
+        )
+        conn.executemany(
+            "INSERT INTO checklist (fecha, area, responsable, item1,item2,item3,item4,item5,"
+            "item6,item7,item8,item9,item10, periodo) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+            ((_fecha(rnd), rnd.choice(PROCESOS), "Supervisor",
+              *[rnd.choice(["Sí", "No"]) for _ in range(10)], rnd.choice(["PRE", "POST"]))
+             for _ in range(max(filas // 10, 1))),
+        )
+        conn.commit()
+        if enteros:
+            migrate_enteros.convertir(conn)
+        if dimensiones:
+            migrate_dimensiones.convertir(conn)
+    finally:
+        conn.close()
+
+
+# ---------- OPERACIONES ----------
+def op_insert(rnd):
+    db.insert_residuo(*_residuo(rnd))
+
+def op_edit(rnd):
+    filas = db.list_residuos(limit=20, with_id=True)
+    if filas:
+        rid = rnd.choice(filas)[0]
+        db.update_residuo(rid, *_residuo(rnd))
+
+def op_dashboard(rnd):
+    periodo = rnd.choice([None, "PRE", "POST"])
+    get_kpis(periodo)
+    db.df_residuos(periodo)
+    db.df_costos(periodo)
+    db.df_checklist(periodo)
+
+def op_export(rnd):
+    bundle_bytes(rnd.choice([None, "PRE", "POST"]))
+
+OPERACIONES = {"insert": op_insert, "edit": op_edit, "dashboard": op_dashboard, "export": op_export}
+
+
+# ---------- SESIONES ----------
+def sesion(semilla, fin, mezcla):
+    """Corre operaciones hasta `fin`. Devuelve {op: ([latencias s], {error: n})}."""
+    rnd = random.Random(semilla)
+    ops, pesos = zip(*mezcla.items())
+    res = defaultdict(lambda: ([], defaultdict(int)))
+    while time.time() < fin:
+        op = rnd.choices(ops, pesos)[0]
+        t0 = time.perf_counter()
+        try:
+            OPERACIONES[op](rnd)
+            res[op][0].append(time.perf_counter() - t0)
+        except sqlite3.OperationalError as e:
+            clave = "bloqueo" if ("locked" in str(e) or "busy" in str(e)) else f"OperationalError: {e}"
+            res[op][1][clave] += 1
+        except Exception as e:  # se informa, no se detiene la prueba
+            res[op][1][type(e).__name__] += 1
+    return {op: (lat, dict(err)) for op, (lat, err) in res.items()}
+
+def _unir(destino, origen):
+    for op, (lat, err) in origen.items():
+        d_lat, d_err = destino.setdefault(op, ([], {}))
+        d_lat.extend(lat)
+        for k, n in err.items():
+            d_err[k] = d_err.get(k, 0) + n
+
+def correr_hilos(db_path, hilos, fin, mezcla, semilla=0):
+    db.DB_PATH = Path(db_path)
+    resultados = [None] * hilos
+
+    def correr(i):
+        resultados[i] = sesion(semilla + i, fin, mezcla)
+
+    ts = [threading.Thread(target=correr, args=(i,)) for i in range(hilos)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    total = {}
+    for r in resultados:
+        _unir(total, r)
+    return total
+
+def _correr_proceso(args):
+    return correr_hilos(*args)
+
+
+# ---------- REPORTE ----------
+def _percentil(ordenados, p):
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+def resumen(resultados, duracion, wal):
+    ops = {}
+    for op, (lat, err) in sorted(resultados.items()):
+        lat = sorted(lat)
+        ops[op] = {
+            "ok": len(lat),
+            "ops_s": round(len(lat) / duracion, 2),
+            "p50_ms": round(_percentil(lat, 50) * 1000, 2),
+            "p95_ms": round(_percentil(lat, 95) * 1000, 2),
+            "p99_ms": round(_percentil(lat, 99) * 1000, 2),
+            "max_ms": round((lat[-1] if lat else 0) * 1000, 2),
+            "errores": err,
+        }
+    return {
+        "duracion_s": round(duracion, 2),
+        "ops_s_total": round(sum(o["ok"] for o in ops.values()) / duracion, 2),
+        "errores_bloqueo": sum(o["errores"].get("bloqueo", 0) for o in ops.values()),
+        "wal_bytes": wal,
+        "operaciones": ops,
+    }
+
+def imprimir(r):
+    print(f"\nDuración: {r['duracion_s']} s  •  Total: {r['ops_s_total']} ops/s  •  "
+          f"Errores por bloqueo: {r['errores_bloqueo']}")
+    print(f"WAL: inicio {r['wal_bytes']['inicio']} B, máximo {r['wal_bytes']['maximo']} B, "
+          f"final {r['wal_bytes']['final']} B")
+    print(f"\n{'operación':<10} {'ok':>7} {'ops/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}  errores")
+    for op, o in r["operaciones"].items():
+        print(f"{op:<10} {o['ok']:>7} {o['ops_s']:>8} {o['p50_ms']:>8} {o['p95_ms']:>8} "
+              f"{o['p99_ms']:>8} {o['max_ms']:>8}  {o['errores'] or '-'}")
+
+def main():
+    ap = argparse.ArgumentParser(description="Prueba de carga de src/db.py con sesiones concurrentes.")
+    ap.add_argument("--db", type=Path, help="base a usar (por defecto, una nueva en un directorio temporal)")
+    ap.add_argument("--filas", type=int, default=20000, help="residuos iniciales al crear la base")
+    ap.add_argument("--hilos", type=int, default=8, help="sesiones (hilos) por proceso")
+    ap.add_argument("--procesos", type=int, default=1, help="procesos, cada uno con --hilos sesiones")
+    ap.add_argument("--duracion", type=float, default=20.0, help="segundos de prueba")
+    ap.add_argument("--mezcla", default=",".join(f"{k}={v}" for k, v in MEZCLA.items()),
+                    help="pesos por operación, p. ej. insert=40,edit=15,dashboard=35,export=10")
+    ap.add_argument("--enteros", action="store_true", help="crear la base en modo entero (migrate_enteros.py)")
+    ap.add_argument("--dimensiones", action="store_true",
+                    help="crear la base con catálogos dim_* (migrate_dimensiones.py)")
+    ap.add_argument("--json", action="store_true", help="imprimir el resultado como JSON")
+    args = ap.parse_args()
+
+    mezcla = {k: float(v) for k, v in (par.split("=") for par in args.mezcla.split(","))}
+    desconocidas = set(mezcla) - set(OPERACIONES)
+    if desconocidas:
+        ap.error(f"operaciones desconocidas: {', '.join(sorted(desconocidas))}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or Path(tmp) / "carga.db"
+        if not db_path.exists():
+            preparar_base(db_path, args.filas, args.enteros, args.dimensiones)
+        wal_path = db.ruta_wal(db_path)
+        wal = {"inicio": db.tam_archivo(wal_path), "maximo": db.tam_archivo(wal_path)}
+        parar = threading.Event()
+
+        def vigilar_wal():
+            while not parar.wait(0.2):
+                wal["maximo"] = max(wal["maximo"], db.tam_archivo(wal_path))
+
+        monitor = threading.Thread(target=vigilar_wal, daemon=True)
+        monitor.start()
+        t0 = time.time()
+        fin = t0 + args.duracion
+        if args.procesos > 1:
+            with mp.Pool(args.procesos) as pool:
+                partes = pool.map(_correr_proceso, [(db_path, args.hilos, fin, mezcla, i * 1000)
+                                                    for i in range(args.procesos)])
+            resultados = {}
+            for p in partes:
+                _unir(resultados, p)
+        else:
+            resultados = correr_hilos(db_path, args.hilos, fin, mezcla)
+        duracion = time.time() - t0
+        parar.set()
+        monitor.join()
+        wal["final"] = db.tam_archivo(wal_path)
+        wal["maximo"] = max(wal["maximo"], wal["final"])
+
+    r = resumen(resultados, duracion, wal)
+    if args.json:
+        print(json.dumps(r, ensure_ascii=False, indent=2))
+    else:
+        imprimir(r)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# maintain_db.py
+"""Mantenimiento de la base: ANALYZE, vacuum incremental y checkpoint del WAL."""
+import argparse
+import time
+
+from src import mantenimiento
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--loop", type=float, metavar="SEG", help="repetir cada SEG segundos")
+    ap.add_argument("--quieto", type=float, default=60, help="segundos sin escrituras para hacer checkpoint")
+    ap.add_argument("--paginas", type=int, help="máximo de páginas a liberar por corrida (por defecto, todas)")
+    ap.add_argument("--analysis-limit", type=int, default=mantenimiento.ANALYSIS_LIMIT,
+                    help="filas por índice para ANALYZE (por defecto 0 = completo)")
+    ap.add_argument("--activar-auto-vacuum", action="store_true",
+                    help="pasar la base a auto_vacuum=INCREMENTAL (una sola vez; reescribe el archivo)")
+    args = ap.parse_args()
+
+    if args.activar_auto_vacuum:
+        mantenimiento.activar_auto_vacuum()
+        print("[OK] auto_vacuum=INCREMENTAL activado")
+
+    while True:
+        r = mantenimiento.ejecutar(quieto_s=args.quieto, paginas_vacuum=args.paginas,
+                                    analysis_limit=args.analysis_limit)
+        print(time.strftime("%Y-%m-%d %H:%M:%S"), mantenimiento.resumen(r))
+        if not args.loop:
+            break
+        time.sleep(args.loop)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# migrate_dimensiones.py
+"""
+Pasa proceso, destino y responsable (residuos) y area y responsable
+(checklist) de texto a ids de los catálogos dim_* creados por init_db.py.
+Los valores que aún no estén en un catálogo se agregan. src/db.py detecta
+el modo por el tipo de columna y traduce solo, también en una app que ya
+esté corriendo (cada escritura revisa PRAGMA schema_version).
+
+    python migrate_dimensiones.py              # TEXT -> id de catálogo
+    python migrate_dimensiones.py --revertir   # id de catálogo -> TEXT
+"""
+import argparse
+import sqlite3
+from pathlib import Path
+
+from init_db import migrar_columnas
+from src.db import COLS_CATALOGO
+
+DB_PATH = Path(__file__).parent / "db" / "reciclaje.db"
+
+def _a_ids(tabla, cols):
+    return {c: (f"INTEGER REFERENCES dim_{c}(id)", f"(SELECT id FROM dim_{c} WHERE nombre = {tabla}.{c})")
+            for c in cols}
+
+def _a_texto(tabla, cols):
+    return {c: ("TEXT", f"(SELECT nombre FROM dim_{c} WHERE id = {tabla}.{c})") for c in cols}
+
+def _agregar_faltantes(tabla, cols):
+    # valores que aún no están en su catálogo
+    return "".join(f"INSERT OR IGNORE INTO dim_{c} (nombre) "
+                   f"SELECT DISTINCT {c} FROM {tabla} WHERE {c} IS NOT NULL;\n" for c in cols)
+
+def convertir(conn, revertir=False):
+    """Reescribe las tablas en una sola transacción. Devuelve las tablas convertidas."""
+    if revertir:
+        return migrar_columnas(conn, COLS_CATALOGO, "TEXT", _a_texto)
+    return migrar_columnas(conn, COLS_CATALOGO, "INTEGER", _a_ids, previo=_agregar_faltantes)
+
+def main():
+    ap = argparse.ArgumentParser(description="Convierte proceso/destino/área/responsable a ids de catálogo (o de vuelta).")
+    ap.add_argument("--revertir", action="store_true", help="volver a columnas TEXT")
+    args = ap.parse_args()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        for tabla in convertir(conn, args.revertir):
+            print(f"[OK] {tabla} convertida")
+        print("Migración aplicada correctamente.")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# migrate_enteros.py
+"""
+Modo entero (opcional): guarda kg_totales/kg_reciclados en gramos y
+ingresos/costos_evitados/costos_gestion en céntimos, como INTEGER.
+Las sumas dejan de acumular error de coma flotante. src/db.py detecta el
+modo por el tipo de columna y convierte solo, también en una app que ya
+esté corriendo (cada escritura revisa PRAGMA schema_version).
+
+    python migrate_enteros.py              # REAL -> INTEGER escalado
+    python migrate_enteros.py --revertir   # INTEGER escalado -> REAL
+"""
+import argparse
+import sqlite3
+from pathlib import Path
+
+from init_db import migrar_columnas
+from src.db import ESCALAS
+
+DB_PATH = Path(__file__).parent / "db" / "reciclaje.db"
+
+TABLAS = {
+    "residuos": ["kg_totales", "kg_reciclados"],
+    "costos": ["ingresos", "costos_evitados", "costos_gestion"],
+}
+
+def _a_enteros(tabla, cols):
+    return {c: ("INTEGER", f"CAST(ROUND({c} * {ESCALAS[c]}) AS INTEGER)") for c in cols}
+
+def _a_reales(tabla, cols):
+    return {c: ("REAL", f"{c} / {float(ESCALAS[c])}") for c in cols}
+
+def convertir(conn, revertir=False):
+    """Reescribe las tablas en una sola transacción. Devuelve las tablas convertidas."""
+    if revertir:
+        return migrar_columnas(conn, TABLAS, "REAL", _a_reales)
+    return migrar_columnas(conn, TABLAS, "INTEGER", _a_enteros)
+
+def main():
+    ap = argparse.ArgumentParser(description="Convierte kg y soles a enteros escalados (o de vuelta).")
+    ap.add_argument("--revertir", action="store_true", help="volver a columnas REAL")
+    args = ap.parse_args()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        for tabla in convertir(conn, args.revertir):
+            print(f"[OK] {tabla} convertida")
+        print("Migración aplicada correctamente.")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
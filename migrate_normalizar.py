@@ -0,0 +1,50 @@
+# migrate_normalizar.py
+"""
+Deja los datos existentes en forma canónica (fechas YYYY-MM-DD, meses
+YYYY-MM, Sí/No, PRE/POST) con las mismas reglas que usan los formularios
+(src/validacion.py). Las filas que no se pueden normalizar se listan y no
+se modifican.
+"""
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from src.validacion import (
+    COLS_RESIDUOS, COLS_COSTOS, COLS_CHECKLIST,
+    normalizar_residuos, normalizar_costos, normalizar_checklist,
+)
+
+DB_PATH = Path(__file__).parent / "db" / "reciclaje.db"
+
+TABLAS = [
+    ("residuos", COLS_RESIDUOS, normalizar_residuos),
+    ("costos", COLS_COSTOS, normalizar_costos),
+    ("checklist", COLS_CHECKLIST, normalizar_checklist),
+]
+
+def normalizar_tabla(conn, tabla, cols, normalizar):
+    df = pd.read_sql_query(f"SELECT id, {', '.join(cols)} FROM {tabla}", conn).astype(object)
+    ok, rechazadas = normalizar(df)
+    ok = ok.astype(object).where(ok.notna(), None)
+    sets = ", ".join(f"{c}=?" for c in cols)
+    conn.executemany(
+        f"UPDATE {tabla} SET {sets} WHERE id=?",
+        ok[cols + ["id"]].itertuples(index=False, name=None),
+    )
+    print(f"[OK] {tabla}: {len(ok)} filas normalizadas")
+    for r in rechazadas.itertuples():
+        print(f"[SKIP] {tabla} id={r.id}: {r.motivo}")
+
+def main():
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        for tabla, cols, normalizar in TABLAS:
+            normalizar_tabla(conn, tabla, cols, normalizar)
+        conn.commit()
+        print("Migración aplicada correctamente.")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# run_app.py
+"""
+Arranca la app con las cachés ya calientes.
+
+`streamlit run app.py` solo precalcula cuando se abre la primera sesión, así
+que esa sesión paga la lectura en frío. Este lanzador asegura el esquema,
+calienta la base y las cachés (src/precalculo.py) y recién entonces levanta
+el servidor de Streamlit en el mismo proceso: las cachés de resultados viven
+en memoria, así que precalcular en otro proceso no serviría.
+
+    python run_app.py [opciones de streamlit run, p. ej. --server.port 8501]
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from streamlit.web import cli as stcli
+
+import init_db
+from src import precalculo
+
+APP = Path(__file__).resolve().parent / "app.py"
+
+def main():
+    ap = argparse.ArgumentParser(description="Arranca la app con las cachés ya calientes.")
+    ap.add_argument("--sin-paginas", action="store_true",
+                    help="no leer los archivos de la base (solo llenar las cachés de resultados)")
+    args, resto = ap.parse_known_args()
+    # avisos de los hilos de fondo (src/fondo.py, src/mantenimiento.py) en la consola
+    logging.basicConfig(format="%(asctime)s %(name)s %(levelname)s: %(message)s")
+    logging.getLogger("src").setLevel(logging.INFO)
+
+    init_db.actualizar_esquema()
+    t = precalculo.calentar(paginas=not args.sin_paginas)
+    print(f"[OK] Precalentado: {t['bytes_leidos']} B leídos en {t['paginas_ms']} ms, "
+          f"cachés en {t['precalculo_ms']} ms")
+    # el hilo periódico sigue desde aquí; el de app.py ya no se lanza dos veces
+    precalculo.iniciar_precalculo(paginas=False)
+
+    sys.argv = ["streamlit", "run", str(APP), *resto]
+    sys.exit(stcli.main())
+
+if __name__ == "__main__":
+    main()
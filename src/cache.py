@@ -0,0 +1,42 @@
+# src/cache.py
+"""
+Caché de resultados en memoria, válida mientras no cambien los datos.
+
+La clave es (argumentos normalizados, db.data_version()): cualquier
+escritura confirmada avanza la versión y vacía la caché en la siguiente
+llamada. Los resultados se comparten entre sesiones de Streamlit, así que
+no deben modificarse.
+"""
+import inspect
+import threading
+from functools import wraps
+
+from .db import data_version
+
+
+def cacheado(fn):
+    firma = inspect.signature(fn)
+    cache = {}
+    estado = {"version": None}
+    lock = threading.Lock()
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        args_ = firma.bind(*args, **kwargs)
+        args_.apply_defaults()
+        clave = tuple(args_.arguments.items())
+        version = data_version()
+        with lock:
+            if version != estado["version"]:
+                cache.clear()
+                estado["version"] = version
+            if clave in cache:
+                return cache[clave]
+        r = fn(*args, **kwargs)
+        with lock:
+            if estado["version"] == version:
+                cache[clave] = r
+        return r
+
+    wrapper.cache_clear = cache.clear
+    return wrapper
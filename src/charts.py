@@ -0,0 +1,108 @@
+# src/charts.py
+"""
+Specs Vega-Lite de los gráficos del Dashboard.
+
+Las series se agregan por mes en SQL y el spec se arma a mano (sin Altair),
+con solo las filas agregadas como datos. Cada spec se guarda en memoria por
+(gráfico, periodo, versión de datos) con src/cache.py: mientras la base no
+cambie, los reruns de Streamlit reutilizan el mismo dict.
+"""
+from .cache import cacheado
+from .db import get_connection, escala
+from .kpi import SIES_SQL
+
+
+# ---------- SERIES MENSUALES ----------
+def _where(periodo):
+    return (" WHERE periodo = ?", (periodo,)) if periodo else ("", ())
+
+def serie_reciclaje(periodo=None):
+    where, params = _where(periodo)
+    with get_connection() as c:
+        rows = c.execute(f"""
+            SELECT substr(fecha, 1, 7), SUM(kg_totales), SUM(kg_reciclados)
+            FROM residuos{where} GROUP BY 1 ORDER BY 1
+        """, params).fetchall()
+    k = escala("kg_totales")
+    return [
+        {"mes": mes, "kg_tot": round(tot / k, 2), "kg_rec": round(rec / k, 2),
+         "porc_reciclado": round(rec / tot * 100, 2) if tot else 0.0}
+        for mes, tot, rec in rows
+    ]
+
+def serie_ahorro(periodo=None):
+    where, params = _where(periodo)
+    with get_connection() as c:
+        rows = c.execute(f"""
+            SELECT mes, SUM(ingresos + costos_evitados - costos_gestion)
+            FROM costos{where} GROUP BY 1 ORDER BY 1
+        """, params).fetchall()
+    k = escala("ingresos")
+    return [{"mes": mes, "ahorro_neto": round(ahorro / k, 2)} for mes, ahorro in rows]
+
+def serie_cumplimiento(periodo=None):
+    where, params = _where(periodo)
+    with get_connection() as c:
+        rows = c.execute(f"""
+            SELECT substr(fecha, 1, 7), AVG(({SIES_SQL}) * 10.0)
+            FROM checklist{where} GROUP BY 1 ORDER BY 1
+        """, params).fetchall()
+    return [{"mes": mes, "porc_cumplimiento": round(porc, 2)} for mes, porc in rows]
+
+
+# ---------- SPECS ----------
+def _spec(valores, mark, y_field, y_title, tooltip):
+    return {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "data": {"values": valores},
+        "mark": mark,
+        "height": 260,
+        # equivalente a .interactive() de Altair
+        "params": [{"name": "zoom", "select": "interval", "bind": "scales"}],
+        "encoding": {
+            # "YYYY-MM" se lee como medianoche UTC: eje y tooltip también en
+            # UTC, o en husos al oeste de Greenwich cada punto cae en el mes
+            # anterior. (Streamlit reemplaza "data", así que no sirve un
+            # "format"/"parse" ahí.)
+            "x": {"field": "mes", "type": "temporal", "timeUnit": "utcyearmonth",
+                  "title": "Mes", "axis": {"format": "%b %y"}},
+            "y": {"field": y_field, "type": "quantitative", "title": y_title},
+            "tooltip": [{"field": "mes", "type": "temporal", "timeUnit": "utcyearmonth",
+                         "title": "Mes", "format": "%Y-%m"}]
+                       + [{"field": f, "type": "quantitative", "title": t, "format": fmt}
+                          for f, t, fmt in tooltip],
+        },
+    }
+
+def _spec_reciclaje(periodo):
+    valores = serie_reciclaje(periodo)
+    return valores and _spec(
+        valores, {"type": "line", "point": True}, "porc_reciclado", "% reciclado",
+        [("kg_tot", "Kg totales", ".1f"), ("kg_rec", "Kg reciclados", ".1f"),
+         ("porc_reciclado", "% reciclado", ".1f")],
+    )
+
+def _spec_ahorro(periodo):
+    valores = serie_ahorro(periodo)
+    return valores and _spec(
+        valores, {"type": "bar"}, "ahorro_neto", "Ahorro neto (S/.)",
+        [("ahorro_neto", "Ahorro neto (S/.)", ".2f")],
+    )
+
+def _spec_cumplimiento(periodo):
+    valores = serie_cumplimiento(periodo)
+    return valores and _spec(
+        valores, {"type": "line", "point": True}, "porc_cumplimiento", "% cumplimiento",
+        [("porc_cumplimiento", "% cumplimiento", ".1f")],
+    )
+
+CHARTS = {
+    "reciclaje": _spec_reciclaje,
+    "ahorro": _spec_ahorro,
+    "cumplimiento": _spec_cumplimiento,
+}
+
+@cacheado
+def chart_spec(nombre, periodo=None):
+    """Spec Vega-Lite cacheado del gráfico `nombre`; None si no hay datos."""
+    return CHARTS[nombre](periodo) or None
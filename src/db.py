@@ -1,13 +1,53 @@
 # --- al inicio del archivo:
+import json
 import sqlite3
+import sys
 from pathlib import Path
 import pandas as pd
 from contextlib import contextmanager
 
+from .validacion import (
+    ErrorValidacion, COLS_RESIDUOS, COLS_COSTOS, COLS_CHECKLIST,
+    validar_residuo, validar_costos, validar_checklist,
+    normalizar_fecha, normalizar_periodo, normalizar_texto,
+)
+
 DB_PATH = Path(__file__).resolve().parent.parent / "db" / "reciclaje.db"
 
+def ruta_wal(path=None):
+    """Archivo -wal de la base (o de `path`)."""
+    path = Path(path or DB_PATH)
+    return path.with_name(path.name + "-wal")
+
+def tam_archivo(p):
+    """Tamaño en bytes de `p`; 0 si no existe."""
+    try:
+        return p.stat().st_size
+    except FileNotFoundError:
+        return 0
+
 def get_connection():
-    return sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    _revisar_esquema(conn)
+    return conn
+
+def data_version():
+    """
+    Versión de los datos: el último seq del registro de cambios, que avanza
+    con cada escritura confirmada (ver tabla `cambios` en init_db.py).
+    En bases sin esa tabla se usa la firma de los archivos (mtime/tamaño).
+    """
+    try:
+        return ultimo_seq()
+    except sqlite3.OperationalError:
+        firma = []
+        for p in (DB_PATH, ruta_wal()):
+            try:
+                st = p.stat()
+                firma += [st.st_mtime_ns, st.st_size]
+            except FileNotFoundError:
+                firma += [0, 0]
+        return tuple(firma)
 
 @contextmanager
 def db_cursor():
@@ -18,13 +58,182 @@ def db_cursor():
     finally:
         conn.close()
 
+@contextmanager
+def _escritura():
+    """
+    Como db_cursor, pero toma el bloqueo de escritura y revisa el modo de
+    almacenamiento antes de convertir la fila: una migración no puede
+    colarse entre la conversión y el INSERT/UPDATE.
+    """
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        _revisar_esquema(conn)
+        yield conn.cursor()
+        conn.commit()
+    finally:
+        conn.close()
+
+# ---------- MODOS DE ALMACENAMIENTO ----------
+# Se detectan por el tipo de las columnas, así que la misma versión del
+# código sirve antes y después de cada migración. Los tipos quedan en caché
+# junto con PRAGMA schema_version, que cada conexión vuelve a leer (una
+# consulta al encabezado): si otro proceso migró, se detecta en la siguiente
+# operación sin reiniciar la app.
+_tipos = {}  # DB_PATH -> (schema_version, {(tabla, columna): tipo})
+
+def _revisar_esquema(conn):
+    clave = str(DB_PATH)
+    if clave in _tipos and _tipos[clave][0] != conn.execute("PRAGMA schema_version").fetchone()[0]:
+        _tipos.pop(clave, None)
+        for k in [k for k in _catalogos if k[0] == clave]:
+            _catalogos.pop(k, None)
+
+def _tipo_columna(tabla, col):
+    clave = str(DB_PATH)
+    if clave not in _tipos:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        try:
+            conn.execute("BEGIN")  # versión y tipos de la misma instantánea
+            version = conn.execute("PRAGMA schema_version").fetchone()[0]
+            tipos = {(t, r[1]): r[2].upper()
+                     for t in ("residuos", "costos", "checklist")
+                     for r in conn.execute(f"PRAGMA table_info({t})")}
+            _tipos[clave] = (version, tipos)
+        finally:
+            conn.close()
+    return _tipos[clave][1].get((tabla, col))
+
+# ---------- MODO ENTERO (kg en gramos, soles en céntimos) ----------
+# Opcional: migrate_enteros.py pasa estas columnas a INTEGER escalado. Con el
+# modo activo, este módulo convierte al guardar y al leer, así que el resto
+# de la app sigue viendo kg y soles; las sumas en SQL son exactas y se
+# dividen por escala(col) al final.
+COLS = {"residuos": COLS_RESIDUOS, "costos": COLS_COSTOS, "checklist": COLS_CHECKLIST}
+ESCALAS = {"kg_totales": 1000, "kg_reciclados": 1000,
+           "ingresos": 100, "costos_evitados": 100, "costos_gestion": 100}
+
+def modo_entero():
+    """True si la base guarda los montos como enteros escalados."""
+    return _tipo_columna("residuos", "kg_totales") == "INTEGER"
+
+def escala(col):
+    """Factor entre el valor guardado y la unidad de la app (1 fuera del modo entero)."""
+    return ESCALAS.get(col, 1) if modo_entero() else 1
+
+# ---------- CATÁLOGOS (proceso, destino, área, responsable) ----------
+# Cada catálogo es una tabla dim_<nombre> (id, nombre) creada por init_db.py;
+# de ahí salen las opciones de los formularios. Tras migrate_dimensiones.py,
+# residuos y checklist guardan el id en vez del texto: este módulo traduce
+# con un diccionario en memoria (sin JOIN) al guardar y al leer.
+CATALOGOS = ["proceso", "destino", "area", "responsable"]
+COLS_CATALOGO = {"residuos": ["proceso", "destino", "responsable"],
+                 "checklist": ["area", "responsable"]}
+_catalogos = {}  # (DB_PATH, catálogo) -> ({id: nombre}, {nombre: id})
+
+def modo_catalogos():
+    """True si residuos/checklist guardan ids de catálogo en vez de texto."""
+    return _tipo_columna("residuos", "proceso") == "INTEGER"
+
+def _cargar_catalogo(cat, conn=None):
+    if cat not in CATALOGOS:
+        raise ValueError(f"Catálogo no válido: {cat}")
+    if conn is not None:  # dentro de una escritura: ver también lo que agregó
+        filas = conn.execute(f"SELECT id, nombre FROM dim_{cat} ORDER BY id").fetchall()
+    else:
+        conn = get_connection()
+        try:
+            filas = conn.execute(f"SELECT id, nombre FROM dim_{cat} ORDER BY id").fetchall()
+        finally:
+            conn.close()
+    por_id = {i: sys.intern(n) for i, n in filas}
+    _catalogos[(str(DB_PATH), cat)] = (por_id, {n: i for i, n in por_id.items()})
+    return _catalogos[(str(DB_PATH), cat)]
+
+def _catalogo(cat):
+    return _catalogos.get((str(DB_PATH), cat)) or _cargar_catalogo(cat)
+
+def opciones(cat):
+    """Valores del catálogo en orden de alta (siempre leídos de la tabla)."""
+    return list(_cargar_catalogo(cat)[0].values())
+
+def agregar_opcion(cat, nombre, cur=None):
+    """Agrega `nombre` al catálogo si no existe. Devuelve su id. `cur`: escritura en curso."""
+    if cat not in CATALOGOS:
+        raise ValueError(f"Catálogo no válido: {cat}")
+    nombre = normalizar_texto(nombre)
+    if not nombre:
+        raise ErrorValidacion("El nombre no puede estar vacío.")
+    if cur is not None:
+        cur.execute(f"INSERT OR IGNORE INTO dim_{cat} (nombre) VALUES (?)", (nombre,))
+        return _cargar_catalogo(cat, cur.connection)[1][nombre]
+    with db_cursor() as cur:
+        cur.execute(f"INSERT OR IGNORE INTO dim_{cat} (nombre) VALUES (?)", (nombre,))
+    return _cargar_catalogo(cat)[1][nombre]
+
+def clave_catalogo(cat, nombre, cur=None):
+    """id de `nombre` en el catálogo; los valores nuevos se agregan."""
+    if nombre is None:
+        return None
+    por_nombre = _catalogo(cat)[1]
+    return por_nombre[nombre] if nombre in por_nombre else agregar_opcion(cat, nombre, cur)
+
+def nombre_catalogo(cat, ident):
+    if ident is None:
+        return None
+    por_id = _catalogo(cat)[0]
+    if ident not in por_id:  # alta hecha desde otro proceso
+        por_id = _cargar_catalogo(cat)[0]
+    return por_id.get(ident)
+
+def decodificar(cat, serie: pd.Series) -> pd.Series:
+    """Serie de ids -> nombres (sin cambios si la base guarda texto)."""
+    if not modo_catalogos():
+        return serie
+    por_id = _catalogo(cat)[0]
+    if not set(serie.dropna().unique()) <= por_id.keys():
+        por_id = _cargar_catalogo(cat)[0]
+    return serie.map(por_id)
+
+# ---------- CONVERSIÓN AL GUARDAR / LEER ----------
+def _a_almacen(tabla, fila, cur):
+    """Fila en unidades de la app -> fila a guardar. Llamar dentro de _escritura()."""
+    entero, cats = modo_entero(), (COLS_CATALOGO.get(tabla, ()) if modo_catalogos() else ())
+    if not entero and not cats:
+        return tuple(fila)
+    out = []
+    for c, v in zip(COLS[tabla], fila):
+        if v is not None and entero and c in ESCALAS:
+            v = round(v * ESCALAS[c])
+        elif v is not None and c in cats:
+            v = clave_catalogo(c, v, cur)
+        out.append(v)
+    return tuple(out)
+
+def _desde_almacen(tabla, fila, with_id=False):
+    entero, cats = modo_entero(), (COLS_CATALOGO.get(tabla, ()) if modo_catalogos() else ())
+    if fila is None or (not entero and not cats):
+        return fila
+    ident, valores = (fila[:1], fila[1:]) if with_id else ((), fila)
+    out = []
+    for c, v in zip(COLS[tabla], valores):
+        if v is not None and entero and c in ESCALAS:
+            v = v / ESCALAS[c]
+        elif c in cats:
+            v = nombre_catalogo(c, v)
+        out.append(v)
+    return (*ident, *out)
+
 # ---------- CRUD RESIDUOS ----------
+# Los insert/update normalizan con src/validacion.py (lanzan ErrorValidacion):
+# lo guardado ya está en forma canónica y las lecturas no necesitan limpiarlo.
 def insert_residuo(fecha, proceso, lote, kg_totales, kg_reciclados, destino, responsable, periodo):
-    with db_cursor() as cur:
+    fila = validar_residuo(fecha, proceso, lote, kg_totales, kg_reciclados, destino, responsable, periodo)
+    with _escritura() as cur:
         cur.execute("""
             INSERT INTO residuos (fecha, proceso, lote, kg_totales, kg_reciclados, destino, responsable, periodo)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (fecha, proceso, lote, kg_totales, kg_reciclados, destino, responsable, periodo))
+        """, _a_almacen("residuos", fila, cur))
 
 def list_residuos(periodo=None, limit=50, with_id=False):
     sql = f"SELECT {'id, ' if with_id else ''}fecha, proceso, lote, kg_totales, kg_reciclados, destino, responsable, periodo FROM residuos"
@@ -36,7 +245,7 @@ def list_residuos(periodo=None, limit=50, with_id=False):
     params.append(limit)
     with db_cursor() as cur:
         cur.execute(sql, tuple(params))
-        return cur.fetchall()
+        return [_desde_almacen("residuos", r, with_id) for r in cur.fetchall()]
 
 def get_residuo_by_id(rid):
     with db_cursor() as cur:
@@ -44,15 +253,16 @@ def get_residuo_by_id(rid):
             SELECT id, fecha, proceso, lote, kg_totales, kg_reciclados, destino, responsable, periodo
             FROM residuos WHERE id = ?
         """, (rid,))
-        return cur.fetchone()
+        return _desde_almacen("residuos", cur.fetchone(), with_id=True)
 
 def update_residuo(rid, fecha, proceso, lote, kg_totales, kg_reciclados, destino, responsable, periodo):
-    with db_cursor() as cur:
+    fila = validar_residuo(fecha, proceso, lote, kg_totales, kg_reciclados, destino, responsable, periodo)
+    with _escritura() as cur:
         cur.execute("""
             UPDATE residuos
             SET fecha=?, proceso=?, lote=?, kg_totales=?, kg_reciclados=?, destino=?, responsable=?, periodo=?
             WHERE id=?
-        """, (fecha, proceso, lote, kg_totales, kg_reciclados, destino, responsable, periodo, rid))
+        """, (*_a_almacen("residuos", fila, cur), rid))
 
 def delete_residuo(rid):
     with db_cursor() as cur:
@@ -60,11 +270,12 @@ def delete_residuo(rid):
 
 # ---------- CRUD COSTOS ----------
 def insert_costos(mes, ingresos, evitados, gestion, periodo):
-    with db_cursor() as cur:
+    fila = validar_costos(mes, ingresos, evitados, gestion, periodo)
+    with _escritura() as cur:
         cur.execute("""
             INSERT INTO costos (mes, ingresos, costos_evitados, costos_gestion, periodo)
             VALUES (?, ?, ?, ?, ?)
-        """, (mes, ingresos, evitados, gestion, periodo))
+        """, _a_almacen("costos", fila, cur))
 
 def list_costos(periodo=None, limit=50, with_id=False):
     sql = f"SELECT {'id, ' if with_id else ''}mes, ingresos, costos_evitados, costos_gestion, periodo FROM costos"
@@ -76,7 +287,7 @@ def list_costos(periodo=None, limit=50, with_id=False):
     params.append(limit)
     with db_cursor() as cur:
         cur.execute(sql, tuple(params))
-        return cur.fetchall()
+        return [_desde_almacen("costos", r, with_id) for r in cur.fetchall()]
 
 def get_costo_by_id(cid):
     with db_cursor() as cur:
@@ -84,15 +295,16 @@ def get_costo_by_id(cid):
             SELECT id, mes, ingresos, costos_evitados, costos_gestion, periodo
             FROM costos WHERE id=?
         """, (cid,))
-        return cur.fetchone()
+        return _desde_almacen("costos", cur.fetchone(), with_id=True)
 
 def update_costos(cid, mes, ingresos, evitados, gestion, periodo):
-    with db_cursor() as cur:
+    fila = validar_costos(mes, ingresos, evitados, gestion, periodo)
+    with _escritura() as cur:
         cur.execute("""
             UPDATE costos
             SET mes=?, ingresos=?, costos_evitados=?, costos_gestion=?, periodo=?
             WHERE id=?
-        """, (mes, ingresos, evitados, gestion, periodo, cid))
+        """, (*_a_almacen("costos", fila, cur), cid))
 
 def delete_costos(cid):
     with db_cursor() as cur:
@@ -100,11 +312,12 @@ def delete_costos(cid):
 
 # ---------- CRUD CHECKLIST ----------
 def insert_checklist(fecha, area, responsable, items, periodo):
-    with db_cursor() as cur:
+    fila = validar_checklist(fecha, area, responsable, items, periodo)
+    with _escritura() as cur:
         cur.execute("""
             INSERT INTO checklist (fecha, area, responsable, item1,item2,item3,item4,item5,item6,item7,item8,item9,item10, periodo)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (fecha, area, responsable, *items, periodo))
+        """, _a_almacen("checklist", fila, cur))
 
 def list_checklist(periodo=None, limit=50, with_id=False):
     sql = f"SELECT {'id, ' if with_id else ''}fecha, area, responsable, item1,item2,item3,item4,item5,item6,item7,item8,item9,item10, periodo FROM checklist"
@@ -116,7 +329,7 @@ def list_checklist(periodo=None, limit=50, with_id=False):
     params.append(limit)
     with db_cursor() as cur:
         cur.execute(sql, tuple(params))
-        return cur.fetchall()
+        return [_desde_almacen("checklist", r, with_id) for r in cur.fetchall()]
 
 def get_checklist_by_id(cid):
     with db_cursor() as cur:
@@ -124,85 +337,148 @@ def get_checklist_by_id(cid):
             SELECT id, fecha, area, responsable, item1,item2,item3,item4,item5,item6,item7,item8,item9,item10, periodo
             FROM checklist WHERE id=?
         """, (cid,))
-        return cur.fetchone()
+        return _desde_almacen("checklist", cur.fetchone(), with_id=True)
 
 def update_checklist(cid, fecha, area, responsable, items, periodo):
-    with db_cursor() as cur:
+    fila = validar_checklist(fecha, area, responsable, items, periodo)
+    with _escritura() as cur:
         cur.execute("""
             UPDATE checklist
             SET fecha=?, area=?, responsable=?, item1=?,item2=?,item3=?,item4=?,item5=?,item6=?,item7=?,item8=?,item9=?,item10=?, periodo=?
             WHERE id=?
-        """, (fecha, area, responsable, *items, periodo, cid))
+        """, (*_a_almacen("checklist", fila, cur), cid))
 
 def delete_checklist(cid):
     with db_cursor() as cur:
         cur.execute("DELETE FROM checklist WHERE id=?", (cid,))
 
+# ---------- FILTROS ----------
+COL_FECHA = {"residuos": "fecha", "costos": "mes", "checklist": "fecha"}
+
+def filtro_sql(tabla, ids=None, periodo=None, desde=None, hasta=None):
+    """WHERE (o "") y parámetros para IDs, periodo y rango de fechas."""
+    if tabla not in COL_FECHA:
+        raise ValueError(f"Tabla no válida: {tabla}")
+    col_fecha = COL_FECHA[tabla]
+    # costos guarda meses (YYYY-MM): el rango se compara por mes
+    corte = 7 if col_fecha == "mes" else 10
+    conds, params = [], []
+    if ids is not None:
+        conds.append("id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps([int(i) for i in ids]))
+    if periodo:
+        conds.append("periodo = ?")
+        params.append(normalizar_periodo(periodo))
+    if desde:
+        conds.append(f"{col_fecha} >= ?")
+        params.append(normalizar_fecha(desde)[:corte])
+    if hasta:
+        conds.append(f"{col_fecha} <= ?")
+        params.append(normalizar_fecha(hasta)[:corte])
+    return (" WHERE " + " AND ".join(conds)) if conds else "", params
+
+# ---------- OPERACIONES EN LOTE ----------
+# Cada operación es una sola sentencia dentro de una transacción: o se aplica
+# a todas las filas del filtro o a ninguna.
+def _filtro_lote(tabla, **filtro):
+    where, params = filtro_sql(tabla, **filtro)
+    if not where:
+        raise ValueError("La operación en lote necesita IDs o un filtro.")
+    return where, params
+
+def _update_lote(tabla, cambios, filtro):
+    where, params = _filtro_lote(tabla, **filtro)
+    sets = ", ".join(f"{c}=?" for c in cambios)
+    with db_cursor() as cur:
+        cur.execute(f"UPDATE {tabla} SET {sets}{where}", (*cambios.values(), *params))
+        return cur.rowcount
+
+def set_periodo_lote(tabla, periodo_nuevo, **filtro):
+    """Cambia el periodo de todas las filas del filtro. Devuelve cuántas cambió."""
+    return _update_lote(tabla, {"periodo": normalizar_periodo(periodo_nuevo)}, filtro)
+
+def set_responsable_lote(tabla, responsable, **filtro):
+    """Reasigna el responsable (residuos o checklist). Devuelve cuántas filas cambió."""
+    if tabla == "costos":
+        raise ValueError("La tabla costos no tiene responsable.")
+    responsable = normalizar_texto(responsable)
+    if responsable is None:
+        raise ErrorValidacion("El nuevo responsable no puede estar vacío.")
+    where, params = _filtro_lote(tabla, **filtro)
+    with _escritura() as cur:
+        if modo_catalogos():
+            responsable = clave_catalogo("responsable", responsable, cur)
+        cur.execute(f"UPDATE {tabla} SET responsable=?{where}", (responsable, *params))
+        return cur.rowcount
+
+def delete_lote(tabla, **filtro):
+    """Elimina todas las filas del filtro. Devuelve cuántas eliminó."""
+    where, params = _filtro_lote(tabla, **filtro)
+    with db_cursor() as cur:
+        cur.execute(f"DELETE FROM {tabla}{where}", params)
+        return cur.rowcount
+
+# ---------- REGISTRO DE CAMBIOS ----------
+def ultimo_seq():
+    conn = get_connection()
+    try:
+        return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM cambios").fetchone()[0]
+    finally:
+        conn.close()
+
+def cambios_desde(seq=0, tabla=None, limit=None):
+    """
+    Cambios con seq > `seq`, en orden: (seq, tabla, fila_id, op, columnas, ts).
+    Para sincronizar de forma incremental, guardar el último seq recibido y
+    volver a llamar con él.
+    """
+    sql = "SELECT seq, tabla, fila_id, op, columnas, ts FROM cambios WHERE seq > ?"
+    params = [seq]
+    if tabla:
+        sql += " AND tabla = ?"
+        params.append(tabla)
+    sql += " ORDER BY seq"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    with db_cursor() as cur:
+        cur.execute(sql, tuple(params))
+        return cur.fetchall()
+
+def df_cambios(limit=200) -> pd.DataFrame:
+    """
+    Últimos cambios, del más reciente al más antiguo, con ts legible.
+    En bases sin la tabla `cambios` lanza sqlite3.OperationalError.
+    """
+    q = """
+        SELECT seq, datetime(ts, 'unixepoch', 'localtime') AS fecha_hora,
+               tabla, fila_id, op, columnas
+        FROM cambios ORDER BY seq DESC LIMIT ?
+    """
+    # con cursor y no read_sql_query, que envuelve el error de sqlite3
+    with db_cursor() as cur:
+        cur.execute(q, (limit,))
+        return pd.DataFrame(cur.fetchall(), columns=[d[0] for d in cur.description])
+
 # ---------- DATAFRAMES PARA EXPORTAR ----------
-def df_residuos(periodo: str | None = None) -> pd.DataFrame:
-    cols = ["fecha","proceso","lote","kg_totales","kg_reciclados","destino","responsable","periodo"]
-    q = "SELECT " + ",".join(cols) + " FROM residuos"
-    params = ()
-    if periodo in ("PRE","POST"):
-        q += " WHERE periodo=?"
-        params = (periodo,)
-    q += " ORDER BY fecha"
+def _df(tabla, periodo=None, desde=None, hasta=None) -> pd.DataFrame:
+    where, params = filtro_sql(tabla, periodo=periodo if periodo in ("PRE","POST") else None,
+                               desde=desde, hasta=hasta)
+    q = f"SELECT {','.join(COLS[tabla])} FROM {tabla}{where} ORDER BY {COL_FECHA[tabla]}"
     with get_connection() as c:
-        return pd.read_sql_query(q, c, params=params)
-
-def df_costos(periodo: str | None = None) -> pd.DataFrame:
-    cols = ["mes","ingresos","costos_evitados","costos_gestion","periodo"]
-    q = "SELECT " + ",".join(cols) + " FROM costos"
-    params = ()
-    if periodo in ("PRE","POST"):
-        q += " WHERE periodo=?"
-        params = (periodo,)
-    q += " ORDER BY mes"
-    with get_connection() as c:
-        return pd.read_sql_query(q, c, params=params)
-
-def df_checklist(periodo: str | None = None) -> pd.DataFrame:
-    cols = ["fecha","area","responsable","item1","item2","item3","item4","item5","item6","item7","item8","item9","item10","periodo"]
-    q = "SELECT " + ",".join(cols) + " FROM checklist"
-    params = ()
-    if periodo in ("PRE","POST"):
-        q += " WHERE periodo=?"
-        params = (periodo,)
-    q += " ORDER BY fecha"
-    with get_connection() as c:
-        return pd.read_sql_query(q, c, params=params)
-
-def df_residuos(periodo: str | None = None) -> pd.DataFrame:
-    cols = ["fecha","proceso","lote","kg_totales","kg_reciclados","destino","responsable","periodo"]
-    q = "SELECT " + ",".join(cols) + " FROM residuos"
-    params = ()
-    if periodo in ("PRE","POST"):
-        q += " WHERE periodo=?"
-        params = (periodo,)
-    q += " ORDER BY fecha"
-    with get_connection() as c:
-        return pd.read_sql_query(q, c, params=params)
-
-def df_costos(periodo: str | None = None) -> pd.DataFrame:
-    cols = ["mes","ingresos","costos_evitados","costos_gestion","periodo"]
-    q = "SELECT " + ",".join(cols) + " FROM costos"
-    params = ()
-    if periodo in ("PRE","POST"):
-        q += " WHERE periodo=?"
-        params = (periodo,)
-    q += " ORDER BY mes"
-    with get_connection() as c:
-        return pd.read_sql_query(q, c, params=params)
-
-def df_checklist(periodo: str | None = None) -> pd.DataFrame:
-    cols = ["fecha","area","responsable",
-            "item1","item2","item3","item4","item5","item6","item7","item8","item9","item10",
-            "periodo"]
-    q = "SELECT " + ",".join(cols) + " FROM checklist"
-    params = ()
-    if periodo in ("PRE","POST"):
-        q += " WHERE periodo=?"
-        params = (periodo,)
-    q += " ORDER BY fecha"
-    with get_connection() as c:
-        return pd.read_sql_query(q, c, params=params)
\ No newline at end of file
+        df = pd.read_sql_query(q, c, params=params)
+    for col in COLS[tabla]:
+        if escala(col) != 1:
+            df[col] = df[col] / escala(col)
+    for col in COLS_CATALOGO.get(tabla, ()):
+        df[col] = decodificar(col, df[col])
+    return df
+
+def df_residuos(periodo: str | None = None, desde=None, hasta=None) -> pd.DataFrame:
+    return _df("residuos", periodo, desde, hasta)
+
+def df_costos(periodo: str | None = None, desde=None, hasta=None) -> pd.DataFrame:
+    return _df("costos", periodo, desde, hasta)
+
+def df_checklist(periodo: str | None = None, desde=None, hasta=None) -> pd.DataFrame:
+    return _df("checklist", periodo, desde, hasta)
@@ -0,0 +1,40 @@
+# src/fondo.py
+"""
+Hilos de fondo de la app (src/mantenimiento.py, src/precalculo.py).
+
+Streamlit vuelve a ejecutar app.py en cada rerun y en cada sesión; iniciar()
+lanza cada tarea una sola vez por proceso. Si una pasada falla se registra
+con logging y el hilo sigue.
+"""
+import logging
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+_hilos = {}
+_lock = threading.Lock()
+
+
+def iniciar(nombre, paso, intervalo_s, esperar_primero=False):
+    """
+    Lanza (una sola vez por proceso) el hilo `nombre`, que corre paso() ahora
+    (o tras `intervalo_s` si `esperar_primero`) y luego cada `intervalo_s`.
+    Devuelve el hilo.
+    """
+    def bucle():
+        if esperar_primero:
+            time.sleep(intervalo_s)
+        while True:
+            try:
+                paso()
+            except Exception:  # el hilo no debe morir por una pasada fallida
+                log.exception("%s: pasada fallida", nombre)
+            time.sleep(intervalo_s)
+
+    with _lock:
+        hilo = _hilos.get(nombre)
+        if hilo is None or not hilo.is_alive():
+            hilo = _hilos[nombre] = threading.Thread(target=bucle, name=nombre, daemon=True)
+            hilo.start()
+        return hilo
@@ -1,39 +1,33 @@
 # src/kpi.py
-from .db import get_connection
+import pandas as pd
 
-def get_kpis(periodo=None):
+from .cache import cacheado
+from .db import get_connection, filtro_sql, escala, decodificar
+from .validacion import ITEMS, SI
+
+# ítems en "Sí" por fila, calculado en SQL
+SIES_SQL = " + ".join(f"({c} = '{SI}')" for c in ITEMS)
+
+@cacheado
+def get_kpis(periodo=None, desde=None, hasta=None):
     conn = get_connection()
     cur = conn.cursor()
 
     # % reciclados
-    if periodo:
-        cur.execute("SELECT COALESCE(SUM(kg_reciclados),0), COALESCE(SUM(kg_totales),0) FROM residuos WHERE periodo=?", (periodo,))
-    else:
-        cur.execute("SELECT COALESCE(SUM(kg_reciclados),0), COALESCE(SUM(kg_totales),0) FROM residuos")
+    where, params = filtro_sql("residuos", periodo=periodo, desde=desde, hasta=hasta)
+    cur.execute(f"SELECT COALESCE(SUM(kg_reciclados),0), COALESCE(SUM(kg_totales),0) FROM residuos{where}", params)
     sum_rec, sum_tot = cur.fetchone()
     porc_reciclados = (sum_rec / sum_tot * 100.0) if sum_tot else 0.0
 
     # ahorro neto
-    if periodo:
-        cur.execute("SELECT COALESCE(SUM(ingresos + costos_evitados - costos_gestion),0) FROM costos WHERE periodo=?", (periodo,))
-    else:
-        cur.execute("SELECT COALESCE(SUM(ingresos + costos_evitados - costos_gestion),0) FROM costos")
-    ahorro_neto = cur.fetchone()[0] or 0.0
-
-    # % cumplimiento
-    if periodo:
-        cur.execute("SELECT item1,item2,item3,item4,item5,item6,item7,item8,item9,item10 FROM checklist WHERE periodo=?", (periodo,))
-    else:
-        cur.execute("SELECT item1,item2,item3,item4,item5,item6,item7,item8,item9,item10 FROM checklist")
-    rows = cur.fetchall()
-    if rows:
-        total = 0
-        for r in rows:
-            sies = sum(1 for v in r if (v or '').strip().lower() == 'sí')
-            total += (sies / 10) * 100.0
-        porc_cumplimiento = total / len(rows)
-    else:
-        porc_cumplimiento = 0.0
+    where, params = filtro_sql("costos", periodo=periodo, desde=desde, hasta=hasta)
+    cur.execute(f"SELECT COALESCE(SUM(ingresos + costos_evitados - costos_gestion),0) FROM costos{where}", params)
+    ahorro_neto = (cur.fetchone()[0] or 0.0) / escala("ingresos")
+
+    # % cumplimiento (los ítems se guardan normalizados a "Sí"/"No")
+    where, params = filtro_sql("checklist", periodo=periodo, desde=desde, hasta=hasta)
+    cur.execute(f"SELECT AVG(({SIES_SQL}) * 10.0) FROM checklist{where}", params)
+    porc_cumplimiento = cur.fetchone()[0] or 0.0
 
     conn.close()
     return {
@@ -41,3 +35,84 @@ def get_kpis(periodo=None):
         "ahorro_neto": round(ahorro_neto, 2),
         "porc_cumplimiento": round(porc_cumplimiento, 2),
     }
+
+def kpi_dataframe(periodo=None, desde=None, hasta=None):
+    """KPI en una fila, con el formato del CSV de exportación."""
+    kpis = get_kpis(periodo=periodo, desde=desde, hasta=hasta)
+    return pd.DataFrame(
+        [
+            {
+                "periodo": periodo or "TODOS",
+                "% reciclados": float(kpis["porc_reciclados"]),
+                "ahorro_neto": float(kpis["ahorro_neto"]),
+                "% cumplimiento": float(kpis["porc_cumplimiento"]),
+            }
+        ]
+    )
+
+
+# ---------- DESGLOSE POR DIMENSIÓN ----------
+# dimensión -> columna equivalente en cada tabla. El checklist registra el
+# proceso en la columna "area" (Área/Proceso en el formulario). Residuos no
+# tiene área: esa dimensión solo trae el cumplimiento del checklist.
+DIMENSIONES = {
+    "proceso":     {"residuos": "proceso",     "checklist": "area"},
+    "destino":     {"residuos": "destino"},
+    "area":        {"checklist": "area"},
+    "responsable": {"residuos": "responsable", "checklist": "responsable"},
+}
+
+
+@cacheado
+def get_breakdown(dimension, periodo=None, por_mes=False):
+    """
+    KPI agrupados por dimensión (y por mes si `por_mes`): kg, % reciclados
+    y % cumplimiento, según las tablas que tengan esa dimensión. Se agrupan
+    las tablas resumen_residuos / resumen_checklist (init_db.py), que los
+    triggers mantienen al día: unos cientos de filas aunque haya millones
+    de registros.
+    """
+    if dimension not in DIMENSIONES:
+        raise ValueError(f"Dimensión no válida: {dimension}")
+    mapa = DIMENSIONES[dimension]
+    claves = [dimension] + (["mes"] if por_mes else [])
+    mes_sql = ", mes" if por_mes else ""
+    grupo = "GROUP BY 1, 2" if por_mes else "GROUP BY 1"
+    where = " WHERE periodo = ?" if periodo else ""
+    params = (periodo,) if periodo else ()
+
+    partes = []
+    with get_connection() as c:
+        if "residuos" in mapa:
+            df = pd.read_sql_query(
+                f"""
+                SELECT {mapa['residuos']} AS {dimension}{mes_sql},
+                       SUM(n) AS n_residuos,
+                       COALESCE(SUM(kg_totales), 0) AS kg_totales,
+                       COALESCE(SUM(kg_reciclados), 0) AS kg_reciclados
+                FROM resumen_residuos{where} {grupo}
+                """, c, params=params)
+            df[dimension] = decodificar(mapa["residuos"], df[dimension])
+            df[["kg_totales", "kg_reciclados"]] /= escala("kg_totales")
+            df["porc_reciclados"] = (
+                (df["kg_reciclados"] / df["kg_totales"].where(df["kg_totales"] != 0) * 100.0)
+                .fillna(0.0).round(2)
+            )
+            partes.append(df)
+
+        if "checklist" in mapa:
+            chk = pd.read_sql_query(
+                f"""
+                SELECT {mapa['checklist']} AS {dimension}{mes_sql},
+                       SUM(n) AS n_checklist,
+                       SUM(sies) * 10.0 / SUM(n) AS porc_cumplimiento
+                FROM resumen_checklist{where} {grupo}
+                """, c, params=params)
+            chk[dimension] = decodificar(mapa["checklist"], chk[dimension])
+            chk["porc_cumplimiento"] = chk["porc_cumplimiento"].round(2)
+            partes.append(chk)
+
+    df = partes[0]
+    for otra in partes[1:]:
+        df = df.merge(otra, on=claves, how="outer")
+    return df.sort_values(claves, na_position="last").reset_index(drop=True)
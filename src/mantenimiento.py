@@ -0,0 +1,130 @@
+# src/mantenimiento.py
+"""
+Mantenimiento periódico de la base SQLite.
+
+- ANALYZE: estadísticas del planificador al día en cada corrida (PRAGMA
+  optimize en una conexión nueva no analiza nada: solo mira las tablas que
+  esa conexión ya consultó). Completo por defecto, ~0.3 s con 340 mil
+  residuos; `analysis_limit` lo acota, pero en índices de pocos valores
+  (proceso, destino) el muestreo subestima mucho las filas por valor.
+- incremental_vacuum: devuelve al sistema las páginas libres que dejan los
+  borrados masivos. Requiere auto_vacuum=INCREMENTAL (las bases nuevas ya lo
+  traen; en las existentes, activar_auto_vacuum() una vez).
+- wal_checkpoint(TRUNCATE) al final, para que el archivo principal se achique
+  en la misma corrida; solo si no hubo escrituras en los últimos `quieto_s`
+  segundos, para no competir con los formularios.
+
+Se usa desde un hilo de fondo (iniciar_programador) o desde maintain_db.py.
+"""
+import logging
+import sqlite3
+import threading
+import time
+
+from . import db, fondo
+
+ANALYSIS_LIMIT = 0  # filas por índice para ANALYZE; 0 = completo
+
+log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+
+
+def _tamanos():
+    return {"db": db.tam_archivo(db.DB_PATH), "wal": db.tam_archivo(db.ruta_wal())}
+
+def _conectar():
+    # autocommit: VACUUM y los checkpoints no pueden correr dentro de una transacción
+    return sqlite3.connect(db.DB_PATH, timeout=30, isolation_level=None)
+
+def segundos_sin_escrituras(conn):
+    """Segundos desde el último cambio registrado (o desde que se tocó el -wal)."""
+    try:
+        ts = conn.execute("SELECT MAX(ts) FROM cambios").fetchone()[0]
+    except sqlite3.OperationalError:
+        ts = None
+    if ts is None:
+        wal = db.ruta_wal()
+        ts = wal.stat().st_mtime if wal.exists() else 0
+    return time.time() - ts
+
+
+# ---------- PASOS ----------
+def optimizar(conn, limite=ANALYSIS_LIMIT):
+    """ANALYZE de todas las tablas; `limite` filas por índice (0 = completo)."""
+    conn.execute(f"PRAGMA analysis_limit = {int(limite)}")
+    conn.execute("ANALYZE")
+    return {"accion": "analyze", "analysis_limit": int(limite)}
+
+def checkpoint(conn, quieto_s=60, quieto=None):
+    """`quieto`: segundos sin escrituras medidos antes (el vacuum también escribe el -wal)."""
+    if quieto is None:
+        quieto = segundos_sin_escrituras(conn)
+    if quieto < quieto_s:
+        return {"accion": "omitido", "motivo": f"última escritura hace {quieto:.0f} s"}
+    ocupado, paginas_log, paginas_copiadas = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    return {"accion": "truncate", "ocupado": bool(ocupado),
+            "paginas_log": paginas_log, "paginas_copiadas": paginas_copiadas}
+
+def vacuum_incremental(conn, paginas=None):
+    modo = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if modo != 2:
+        return {"accion": "omitido", "motivo": "auto_vacuum no es INCREMENTAL (ver activar_auto_vacuum)"}
+    libres = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    # incremental_vacuum libera una página por paso de la sentencia y execute()
+    # solo da el primero; executescript() la corre hasta el final
+    conn.executescript(f"PRAGMA incremental_vacuum({int(paginas or 0)});")
+    liberadas = libres - conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return {"accion": "incremental_vacuum", "paginas_liberadas": liberadas}
+
+def activar_auto_vacuum():
+    """Pasa una base existente a auto_vacuum=INCREMENTAL (reescribe el archivo con VACUUM)."""
+    conn = _conectar()
+    try:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+
+# ---------- EJECUCIÓN ----------
+def ejecutar(quieto_s=60, paginas_vacuum=None, analysis_limit=ANALYSIS_LIMIT):
+    """Corre los tres pasos (el checkpoint al final) y devuelve tiempos y bytes recuperados."""
+    with _lock:
+        antes = _tamanos()
+        pasos = {}
+        conn = _conectar()
+        try:
+            quieto = segundos_sin_escrituras(conn)
+            for nombre, paso in (("analyze", lambda: optimizar(conn, analysis_limit)),
+                                 ("vacuum", lambda: vacuum_incremental(conn, paginas_vacuum)),
+                                 ("checkpoint", lambda: checkpoint(conn, quieto_s, quieto))):
+                t0 = time.perf_counter()
+                try:
+                    pasos[nombre] = paso()
+                except sqlite3.OperationalError as e:
+                    pasos[nombre] = {"accion": "error", "motivo": str(e)}
+                pasos[nombre]["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        finally:
+            conn.close()
+        despues = _tamanos()
+    return {
+        "pasos": pasos,
+        "antes": antes,
+        "despues": despues,
+        "bytes_recuperados": (antes["db"] + antes["wal"]) - (despues["db"] + despues["wal"]),
+    }
+
+def resumen(r):
+    pasos = " • ".join(
+        f"{n}: {p['accion']} ({p['ms']} ms)" + (f" [{p['motivo']}]" if "motivo" in p else "")
+        for n, p in r["pasos"].items()
+    )
+    return f"{pasos} • recuperados {r['bytes_recuperados']} B (db {r['despues']['db']} B, wal {r['despues']['wal']} B)"
+
+def iniciar_programador(intervalo_s=3600, quieto_s=60):
+    """Lanza (una sola vez por proceso) el hilo que corre ejecutar() cada `intervalo_s`."""
+    def paso():
+        log.info("%s", resumen(ejecutar(quieto_s)))
+
+    return fondo.iniciar("mantenimiento-db", paso, intervalo_s, esperar_primero=True)
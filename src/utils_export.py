@@ -1,5 +1,12 @@
+import io
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pandas as pd
 
+from . import db
+from .kpi import kpi_dataframe
+
 def to_csv_bytes(df: pd.DataFrame) -> bytes:
     """
     Convierte un DataFrame a CSV en bytes (UTF-8 con BOM)
@@ -7,3 +14,34 @@ def to_csv_bytes(df: pd.DataFrame) -> bytes:
     """
     csv_str = df.to_csv(index=False)
     return csv_str.encode("utf-8-sig")
+
+
+# ---------- PAQUETE COMPLETO (ZIP) ----------
+def _partes_bundle(periodo=None, desde=None, hasta=None):
+    """(nombre de archivo, función que arma su DataFrame) de cada parte del paquete."""
+    return [
+        ("residuos.csv", lambda: db.df_residuos(periodo, desde, hasta)),
+        ("costos.csv", lambda: db.df_costos(periodo, desde, hasta)),
+        ("checklist.csv", lambda: db.df_checklist(periodo, desde, hasta)),
+        ("kpi.csv", lambda: kpi_dataframe(periodo, desde, hasta)),
+    ]
+
+def write_bundle(destino, periodo=None, desde=None, hasta=None, max_workers=4):
+    """
+    Escribe en `destino` (ruta o archivo binario) un ZIP con las tres tablas
+    y los KPI. Cada parte se lee y se pasa a CSV en su propio hilo (cada
+    lectura abre su conexión); el hilo principal va comprimiendo cada CSV
+    en cuanto está listo, así el total dura casi lo que la tabla más grande.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool, \
+            zipfile.ZipFile(destino, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        futuros = {pool.submit(lambda f=f: to_csv_bytes(f())): nombre
+                   for nombre, f in _partes_bundle(periodo, desde, hasta)}
+        for fut in as_completed(futuros):
+            zf.writestr(futuros[fut], fut.result())
+
+def bundle_bytes(periodo=None, desde=None, hasta=None) -> bytes:
+    """Paquete ZIP en memoria, para st.download_button."""
+    buf = io.BytesIO()
+    write_bundle(buf, periodo, desde, hasta)
+    return buf.getvalue()
@@ -0,0 +1,234 @@
+# src/validacion.py
+"""
+Validación y normalización de registros.
+
+Cada regla se escribe una sola vez sobre columnas de pandas (operaciones
+vectorizadas) y sirve igual para un valor suelto, un formulario o una
+importación completa:
+
+- `normalizar_*` de campo: aceptan un escalar o una Serie. Con Serie
+  devuelven la Serie normalizada (NA donde el valor no es válido); con
+  escalar devuelven el valor canónico o lanzan ErrorValidacion.
+- `normalizar_residuos/costos/checklist(df)`: devuelven (ok, rechazadas),
+  con una columna "motivo" en las rechazadas.
+- `validar_residuo/costos/checklist(...)`: mismo orden de argumentos que
+  los insert_* de src/db.py; devuelven la tupla lista para guardar. Aplican
+  las mismas reglas de tabla sobre escalares, sin armar un DataFrame.
+
+Valores canónicos: fechas "YYYY-MM-DD", meses "YYYY-MM", "Sí"/"No" y
+periodo "PRE"/"POST".
+"""
+import math
+import warnings
+from datetime import datetime
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+PERIODOS = ("PRE", "POST")
+SI, NO = "Sí", "No"
+_VALORES_SI = ("si", "sí", "1", "true")
+
+ITEMS = [f"item{i}" for i in range(1, 11)]
+COLS_RESIDUOS = ["fecha", "proceso", "lote", "kg_totales", "kg_reciclados", "destino", "responsable", "periodo"]
+COLS_COSTOS = ["mes", "ingresos", "costos_evitados", "costos_gestion", "periodo"]
+COLS_CHECKLIST = ["fecha", "area", "responsable", *ITEMS, "periodo"]
+
+
+class ErrorValidacion(ValueError):
+    """Registro o valor que no cumple las reglas de negocio."""
+
+
+def _escalar_o_serie(mensaje, rapido=None):
+    """
+    Permite llamar con un escalar una regla escrita para Series. `rapido(v)`
+    resuelve los casos comunes sin pandas (None si no puede); lo demás pasa
+    por la regla vectorizada, que es la que manda.
+    """
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(v):
+            if isinstance(v, pd.Series):
+                return fn(v)
+            r = None
+            if rapido is not None:
+                try:
+                    r = rapido(v)
+                except (TypeError, ValueError, OverflowError):
+                    r = None
+            if r is None:
+                r = fn(pd.Series([v], dtype=object)).iloc[0]
+            if pd.isna(r):
+                raise ErrorValidacion(mensaje.format(v=v))
+            return r.item() if isinstance(r, np.generic) else r
+        return wrapper
+    return deco
+
+
+# ---------- CAMPOS ----------
+def _fecha_rapida(v):
+    return datetime.fromisoformat(str(v).strip()).strftime("%Y-%m-%d")
+
+def _mes_rapido(v):
+    return datetime.strptime(str(v).strip(), "%Y-%m").strftime("%Y-%m")
+
+def _periodo_rapido(v):
+    per = str(v).strip().upper()
+    return per if per in PERIODOS else None
+
+def _cantidad_rapida(v):
+    num = float(v)
+    return num if math.isfinite(num) and num >= 0 else None
+
+def _si_no_rapido(v):
+    return SI if str(v).strip().lower() in _VALORES_SI else NO
+
+def _formatear(txt, formato, salida):
+    """
+    Parsea la columna con `formato` y la devuelve como texto `salida` (NA si no
+    es válida). Con offsets UTC distintos en la misma columna pandas no da una
+    columna de fechas: se parsea valor por valor y cada uno conserva su fecha
+    local, igual que la vía escalar.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        try:
+            fechas = pd.to_datetime(txt, format=formato, errors="coerce")
+        except ValueError:
+            fechas = None
+    if fechas is not None and pd.api.types.is_datetime64_any_dtype(fechas):
+        return fechas.dt.strftime(salida).where(fechas.notna())
+
+    def uno(v):
+        f = pd.to_datetime(v, format=formato, errors="coerce")
+        return np.nan if pd.isna(f) else f.strftime(salida)
+    return txt.map(uno)
+
+@_escalar_o_serie("Fecha no válida: {v!r} (usa YYYY-MM-DD).", _fecha_rapida)
+def normalizar_fecha(s):
+    return _formatear(s.astype(str).str.strip(), "ISO8601", "%Y-%m-%d")
+
+@_escalar_o_serie("Mes no válido: {v!r} (usa YYYY-MM).", _mes_rapido)
+def normalizar_mes(s):
+    txt = s.astype(str).str.strip()
+    return _formatear(txt, "%Y-%m", "%Y-%m").fillna(_formatear(txt, "ISO8601", "%Y-%m"))
+
+@_escalar_o_serie("Periodo no válido: {v!r} (usa PRE o POST).", _periodo_rapido)
+def normalizar_periodo(s):
+    per = s.astype(str).str.strip().str.upper()
+    return per.where(per.isin(PERIODOS))
+
+@_escalar_o_serie("Cantidad no válida: {v!r} (debe ser un número finito ≥ 0).", _cantidad_rapida)
+def normalizar_cantidad(s):
+    num = pd.to_numeric(s, errors="coerce").astype(float)
+    return num.where(np.isfinite(num) & (num >= 0))
+
+@_escalar_o_serie("", _si_no_rapido)
+def normalizar_si_no(s):
+    es_si = s.astype(str).str.strip().str.lower().isin(_VALORES_SI)
+    return pd.Series(np.where(es_si, SI, NO), index=s.index, dtype=object)
+
+def normalizar_texto(v):
+    """Quita espacios; el texto vacío queda como None. Escalar o Serie."""
+    if isinstance(v, pd.Series):
+        txt = v.astype("string").str.strip().replace("", pd.NA).astype(object)
+        return txt.where(txt.notna(), None)
+    txt = str(v).strip() if v is not None else ""
+    return txt or None
+
+
+# ---------- TABLAS ----------
+# Las reglas de tabla usan pd.isna y comparaciones, que valen igual para
+# columnas (Series) que para un registro suelto (escalares, NaN si inválido).
+def _separar(df, reglas):
+    """reglas: [(máscara de filas inválidas, motivo)] en orden de prioridad."""
+    motivo = pd.Series(np.select([m for m, _ in reglas], [t for _, t in reglas], default=""),
+                       index=df.index)
+    ok = motivo == ""
+    return df[ok].copy(), df[~ok].assign(motivo=motivo[~ok])
+
+def _campos_residuos(out, campo):
+    out["fecha"] = campo(normalizar_fecha, out["fecha"])
+    for c in ("proceso", "lote", "destino", "responsable"):
+        out[c] = campo(normalizar_texto, out[c])
+    out["kg_totales"] = campo(normalizar_cantidad, out["kg_totales"])
+    out["kg_reciclados"] = campo(normalizar_cantidad, out["kg_reciclados"])
+    out["periodo"] = campo(normalizar_periodo, out["periodo"])
+    return [
+        (pd.isna(out["fecha"]), "Fecha no válida (usa YYYY-MM-DD)."),
+        (pd.isna(out["proceso"]), "El proceso es obligatorio."),
+        (pd.isna(out["kg_totales"]) | pd.isna(out["kg_reciclados"]), "Los Kg deben ser números finitos ≥ 0."),
+        (out["kg_reciclados"] > out["kg_totales"], "Los Kg reciclados no pueden ser mayores que los Kg totales."),
+        (pd.isna(out["periodo"]), "Periodo no válido (usa PRE o POST)."),
+    ]
+
+def _campos_costos(out, campo):
+    out["mes"] = campo(normalizar_mes, out["mes"])
+    for c in ("ingresos", "costos_evitados", "costos_gestion"):
+        out[c] = campo(normalizar_cantidad, out[c])
+    out["periodo"] = campo(normalizar_periodo, out["periodo"])
+    montos_na = (pd.isna(out["ingresos"]) | pd.isna(out["costos_evitados"])
+                 | pd.isna(out["costos_gestion"]))
+    return [
+        (pd.isna(out["mes"]), "Mes no válido (usa YYYY-MM)."),
+        (montos_na, "Los montos deben ser números finitos ≥ 0."),
+        (pd.isna(out["periodo"]), "Periodo no válido (usa PRE o POST)."),
+    ]
+
+def _campos_checklist(out, campo):
+    out["fecha"] = campo(normalizar_fecha, out["fecha"])
+    out["area"] = campo(normalizar_texto, out["area"])
+    out["responsable"] = campo(normalizar_texto, out["responsable"])
+    for c in ITEMS:
+        out[c] = campo(normalizar_si_no, out[c])
+    out["periodo"] = campo(normalizar_periodo, out["periodo"])
+    return [
+        (pd.isna(out["fecha"]), "Fecha no válida (usa YYYY-MM-DD)."),
+        (pd.isna(out["periodo"]), "Periodo no válido (usa PRE o POST)."),
+    ]
+
+def _columna(regla, s):
+    return regla(s)
+
+def _normalizar_tabla(df, campos):
+    out = df.copy()
+    return _separar(out, campos(out, _columna))
+
+def normalizar_residuos(df):
+    return _normalizar_tabla(df, _campos_residuos)
+
+def normalizar_costos(df):
+    return _normalizar_tabla(df, _campos_costos)
+
+def normalizar_checklist(df):
+    return _normalizar_tabla(df, _campos_checklist)
+
+
+# ---------- REGISTROS SUELTOS (formularios / src/db.py) ----------
+def _escalar(regla, v):
+    """Valor canónico, o NaN si no es válido (como en la versión por columnas)."""
+    try:
+        return regla(v)
+    except ErrorValidacion:
+        return np.nan
+
+def _validar_fila(campos, cols, valores):
+    fila = dict(zip(cols, valores))
+    for invalida, motivo in campos(fila, _escalar):
+        if invalida:
+            raise ErrorValidacion(motivo)
+    return tuple(None if pd.isna(fila[c]) else fila[c] for c in cols)
+
+def validar_residuo(fecha, proceso, lote, kg_totales, kg_reciclados, destino, responsable, periodo):
+    return _validar_fila(_campos_residuos, COLS_RESIDUOS,
+                         [fecha, proceso, lote, kg_totales, kg_reciclados, destino, responsable, periodo])
+
+def validar_costos(mes, ingresos, evitados, gestion, periodo):
+    return _validar_fila(_campos_costos, COLS_COSTOS, [mes, ingresos, evitados, gestion, periodo])
+
+def validar_checklist(fecha, area, responsable, items, periodo):
+    items = list(items)
+    if len(items) != len(ITEMS):
+        raise ErrorValidacion(f"El checklist debe tener {len(ITEMS)} ítems.")
+    return _validar_fila(_campos_checklist, COLS_CHECKLIST, [fecha, area, responsable, *items, periodo])
@@ -0,0 +1,31 @@
+# tests/test_validacion.py
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.validacion import (  # noqa: E402
+    COLS_RESIDUOS, normalizar_fecha, normalizar_mes, normalizar_residuos,
+)
+
+
+def _residuos(fechas):
+    return pd.DataFrame([[f, "Corte", "L-1", 10, 5, "Venta", "Ana", "PRE"] for f in fechas],
+                        columns=COLS_RESIDUOS)
+
+
+def test_fechas_con_offsets_mezclados():
+    ok, rechazadas = normalizar_residuos(
+        _residuos(["2025-01-05", "2025-01-06T00:00+00:00", "2025-01-07T23:30-05:00", "no es fecha"]))
+    # cada fecha conserva su día local, igual que la vía escalar
+    assert ok["fecha"].tolist() == ["2025-01-05", "2025-01-06", "2025-01-07"]
+    assert rechazadas["motivo"].tolist() == ["Fecha no válida (usa YYYY-MM-DD)."]
+    assert normalizar_fecha("2025-01-07T23:30-05:00") == "2025-01-07"
+
+
+def test_meses_con_offsets_mezclados():
+    meses = normalizar_mes(pd.Series(["2025-01", "2025-02-01T00:00+00:00", "2025-03-01T00:00-05:00", "x"]))
+    assert meses.iloc[:3].tolist() == ["2025-01", "2025-02", "2025-03"]
+    assert pd.isna(meses.iloc[3])